@@ -0,0 +1,204 @@
+"""
+Celery tasks that render, upload and email reports outside the API process
+
+The task queue is used when CELERY_BROKER_URL is set. Drive and email work are
+routed to separate queues so their worker concurrency can be tuned
+independently, e.g.:
+
+    celery -A api.celery_tasks worker -Q drive_queue --concurrency 4
+    celery -A api.celery_tasks worker -Q email_queue --concurrency 8
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import subprocess
+import sys
+from functools import lru_cache
+from typing import Optional
+
+from celery import Celery
+from celery.result import AsyncResult
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDERER_AVAILABLE = False
+if os.getenv("PDF_BACKEND", "weasyprint").lower() != "pandoc":
+    try:
+        from pdf_renderer import render_markdown_to_pdf
+
+        PDF_RENDERER_AVAILABLE = True
+    except (ImportError, OSError):
+        pass
+
+PDF_OPTIMIZER_AVAILABLE = False
+if os.getenv("PDF_OPTIMIZE", "").lower() in ("1", "true", "yes"):
+    try:
+        from pdf_optimizer import optimize_pdf
+
+        PDF_OPTIMIZER_AVAILABLE = True
+    except ImportError:
+        pass
+
+BROKER_URL = os.getenv("CELERY_BROKER_URL")
+
+celery_app = Celery(
+    "research",
+    broker=BROKER_URL,
+    backend=os.getenv("CELERY_RESULT_BACKEND", BROKER_URL),
+)
+celery_app.conf.task_routes = {
+    "research.generate_and_deliver": {"queue": "drive_queue"},
+    "research.send_report_email": {"queue": "email_queue"},
+}
+
+
+def get_drive_uploader():
+    """Return the worker process's shared Google Drive uploader"""
+    from drive_uploader_complete import get_uploader
+
+    return get_uploader()
+
+
+@lru_cache(maxsize=1)
+def get_email_service():
+    """Build the email service once per worker process"""
+    from email_service import EmailService
+
+    return EmailService()
+
+
+@lru_cache(maxsize=1)
+def get_event_loop():
+    """
+    Event loop for the worker process's async calls
+
+    Kept for the life of the process so the email service's SMTP session,
+    which is bound to the loop it was opened on, is reused across tasks.
+    """
+    return asyncio.new_event_loop()
+
+
+def render_pdf(markdown_text: str) -> bytes:
+    """Render markdown to PDF with WeasyPrint, falling back to pandoc"""
+    if PDF_RENDERER_AVAILABLE:
+        pdf_bytes = render_markdown_to_pdf(markdown_text)
+    else:
+        pdf_bytes = subprocess.run(
+            ["pandoc", "-f", "markdown", "-t", "pdf", "-o", "-"],
+            input=markdown_text.encode("utf-8"),
+            capture_output=True,
+            check=True,
+        ).stdout
+
+    if PDF_OPTIMIZER_AVAILABLE:
+        pdf_bytes = optimize_pdf(pdf_bytes)
+    return pdf_bytes
+
+
+@celery_app.task(
+    name="research.generate_and_deliver",
+    bind=True,
+    autoretry_for=(subprocess.CalledProcessError,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def generate_and_deliver(
+    self,
+    markdown_text: str,
+    company_name: str,
+    pdf_filename: str,
+    email: Optional[str] = None,
+    folder_id: Optional[str] = None,
+    description: Optional[str] = None,
+) -> dict:
+    """
+    Render a report to PDF, upload it to Google Drive and queue the email
+
+    Returns:
+        Dict with the Drive upload result and whether an email was queued
+    """
+    pdf_bytes = render_pdf(markdown_text)
+    logger.info("PDF generated for %s (%d bytes)", company_name, len(pdf_bytes))
+
+    drive_result = None
+    if folder_id:
+        upload_result = get_drive_uploader().upload_bytes(
+            pdf_bytes,
+            filename=pdf_filename,
+            folder_id=folder_id,
+            description=description,
+        )
+        if not upload_result:
+            raise self.retry(exc=RuntimeError("Google Drive upload failed"))
+        drive_result = {
+            "success": True,
+            "file_id": upload_result.get("id"),
+            "file_name": upload_result.get("name"),
+            "view_link": upload_result.get("webViewLink"),
+        }
+
+    if email:
+        # Bytes are base64-encoded so the message stays JSON-serializable
+        send_report_email.delay(
+            email,
+            company_name,
+            pdf_filename,
+            drive_result["view_link"] if drive_result else None,
+            base64.b64encode(pdf_bytes).decode("ascii"),
+        )
+
+    return {
+        "company_name": company_name,
+        "pdf_filename": pdf_filename,
+        "drive_upload": drive_result,
+        "email_queued": bool(email),
+    }
+
+
+@celery_app.task(
+    name="research.send_report_email",
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+)
+def send_report_email(
+    self,
+    to_email: str,
+    company_name: str,
+    pdf_filename: str,
+    drive_link: Optional[str],
+    pdf_base64: str,
+) -> dict:
+    """Email a rendered report as an attachment"""
+    email_service = get_email_service()
+    if not email_service.is_configured():
+        return {"success": False, "error": "Email service not configured"}
+
+    email_result = get_event_loop().run_until_complete(
+        email_service.send_pdf_report(
+            to_email=to_email,
+            company_name=company_name,
+            pdf_path=None,
+            pdf_filename=pdf_filename,
+            drive_link=drive_link,
+            pdf_bytes=base64.b64decode(pdf_base64),
+        )
+    )
+    if not email_result.get("success"):
+        raise self.retry(exc=RuntimeError(email_result.get("error")))
+    return email_result
+
+
+def job_status(job_id: str) -> dict:
+    """Look up a delivery job in the result backend"""
+    result = AsyncResult(job_id, app=celery_app)
+    status = {"job_id": job_id, "state": result.state}
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    return status
@@ -1,27 +1,51 @@
 import asyncio
+import atexit
+import concurrent.futures
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import subprocess
 import sys
-import tempfile
 import time
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse, JSONResponse
+import httpx
+import msgspec
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+)
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
 
 if TYPE_CHECKING:
     from email_service import EmailService
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+# Records are queued on the request path and formatted/written to stdout by a
+# background listener thread, so handlers never contend for the stdout lock
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+log_queue: queue.Queue = queue.Queue(-1)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+stdout_handler = logging.StreamHandler(sys.stdout)
+stdout_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+log_listener = logging.handlers.QueueListener(log_queue, stdout_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Add the parent directory to sys.path to find third_party_api module
@@ -33,11 +57,12 @@ from researchers.multi_source_researcher import MultiSourceResearcher
 
 # Import Apollo API for backward compatibility (if needed elsewhere)
 from third_party_api.coresignal_multisource_api import CoreSignalMultiSourceAPI
+from third_party_api.http_client import create_async_client
 
 # Import Google Drive uploader
 try:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from drive_uploader_complete import GoogleDriveUploader
+    from drive_uploader_complete import get_uploader
 
     GOOGLE_DRIVE_AVAILABLE = True
     logger.info("Google Drive uploader imported successfully")
@@ -69,13 +94,163 @@ except ImportError as e:
     EMAIL_SERVICE_AVAILABLE = False
     logger.warning("Email service not available: %s", e)
 
-app = FastAPI(title="Company Research PDF Report API", version="2.0.0")
+# Import in-process PDF renderer (falls back to the pandoc CLI when unavailable).
+# PDF_BACKEND=pandoc skips it and always converts with the pandoc CLI.
+PDF_BACKEND = os.getenv("PDF_BACKEND", "weasyprint").lower()
+PDF_RENDERER_AVAILABLE = False
+if PDF_BACKEND == "pandoc":
+    logger.info("PDF_BACKEND=pandoc, converting PDFs with the pandoc CLI")
+else:
+    try:
+        from pdf_renderer import render_markdown_to_pdf
+
+        PDF_RENDERER_AVAILABLE = True
+        logger.info("In-process PDF renderer imported successfully")
+    except (ImportError, OSError) as e:
+        logger.warning("In-process PDF renderer not available, using pandoc: %s", e)
+
+# Optional qpdf-based size optimization of generated PDFs (PDF_OPTIMIZE=1)
+PDF_OPTIMIZER_AVAILABLE = False
+if os.getenv("PDF_OPTIMIZE", "").lower() in ("1", "true", "yes"):
+    try:
+        from pdf_optimizer import optimize_pdf
+
+        PDF_OPTIMIZER_AVAILABLE = True
+        logger.info("PDF optimization enabled")
+    except ImportError as e:
+        logger.warning("PDF optimization requested but not available: %s", e)
+
+# Import Celery delivery tasks (used only when a broker URL is configured)
+try:
+    from celery_tasks import generate_and_deliver, job_status
+
+    CELERY_ENABLED = bool(os.getenv("CELERY_BROKER_URL"))
+    if CELERY_ENABLED:
+        logger.info("Celery task queue enabled for background report delivery")
+except ImportError as e:
+    CELERY_ENABLED = False
+    logger.info("Celery task queue not available: %s", e)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded with msgspec instead of the stdlib json module"""
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client used for outbound third-party API calls"""
+    return create_async_client()
+
+
+def create_drive_uploader():
+    """Build the Google Drive uploader, or None when it cannot be initialized"""
+    if not GOOGLE_DRIVE_AVAILABLE:
+        return None
+    try:
+        return get_uploader()
+    except Exception as e:
+        logger.warning("Google Drive uploader could not be initialized: %s", e)
+        return None
+
+
+def configure_worker_logging():
+    """Log directly to stdout in pool workers, which have no queue listener"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[logging.StreamHandler(sys.stdout)],
+        force=True,
+    )
+
+
+def load_index_page() -> Optional[bytes]:
+    """Read the frontend page so GET / is served from memory"""
+    try:
+        with open("static/index.html", "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# Number of uvicorn worker processes. Each one gets an equal share of the CPU
+# cores for its PDF process pool so the machine is not oversubscribed.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+PDF_POOL_SIZE = max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared clients and services once at startup, release them at shutdown"""
+    app.state.http = create_http_client()
+    app.state.drive = create_drive_uploader()
+    app.state.email = (
+        EmailService() if EMAIL_SERVICE_AVAILABLE and EmailService else None
+    )
+    # Process pool that runs PDF conversion off the event loop
+    app.state.pdf_pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=PDF_POOL_SIZE, initializer=configure_worker_logging
+    )
+    app.state.index_html = load_index_page()
+    try:
+        yield
+    finally:
+        app.state.pdf_pool.shutdown(cancel_futures=True)
+        if app.state.email:
+            await app.state.email.close()
+        await app.state.http.aclose()
+
+
+app = FastAPI(
+    title="Company Research PDF Report API",
+    version="2.0.0",
+    default_response_class=MsgspecJSONResponse,
+    lifespan=lifespan,
+)
+
+# API keys and the service account file do not change while the process runs,
+# so /api/health reports these values captured at import time
+API_AVAILABILITY = {
+    "coresignal": bool(os.getenv("CORESIGNAL_API_KEY")),
+    "apollo": bool(os.getenv("APOLLO_API_KEY")),
+    "tavily": bool(os.getenv("TAVILY_API_KEY")),
+    "openai": bool(os.getenv("OPENAI_API_KEY")),
+}
+SERVICE_ACCOUNT_EXISTS = os.path.exists("service_account.json")
+
+# Characters not allowed in generated PDF filenames (\w keeps Unicode letters)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w -]+")
+
+# Drive folder listings are cached per folder ID for a short time
+DRIVE_FILES_CACHE_TTL = float(os.getenv("DRIVE_FILES_CACHE_TTL", "30"))
+_drive_files_cache: dict[str, tuple[float, dict]] = {}
+
+# Multi-source research tasks currently running, keyed by normalized domain
+_research_inflight: dict[str, asyncio.Task] = {}
+
+# File metadata returned by /api/drive-files (missing fields are reported as null)
+DRIVE_FILE_FIELDS = (
+    "id",
+    "name",
+    "mimeType",
+    "size",
+    "createdTime",
+    "modifiedTime",
+    "webViewLink",
+    "webContentLink",
+)
+DRIVE_LIST_FIELDS = f"nextPageToken, files({', '.join(DRIVE_FILE_FIELDS)})"
+
+
+# Compress large JSON responses (raw research data, Drive listings)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 # Add request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     # Log the incoming request
     logger.info("Incoming request: %s %s", request.method, request.url.path)
@@ -84,7 +259,7 @@ async def log_requests(request: Request, call_next):
     response = await call_next(request)
 
     # Calculate processing time
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
 
     # Log the response
     logger.info(
@@ -109,45 +284,214 @@ except RuntimeError:
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
-class CoreSignalCompanyResearchRequest(BaseModel):
+async def research_company_once(domain: str) -> dict:
+    """
+    Run MultiSourceResearcher for a domain, coalescing concurrent calls
+
+    Callers asking for a domain that is already being researched await the
+    same task instead of starting another Apollo/CoreSignal/Tavily/LLM run.
+    The task is shielded so one caller disconnecting does not cancel it for
+    the others.
+    """
+    key = domain.strip().lower()
+    task = _research_inflight.get(key)
+    if task is None:
+        researcher = MultiSourceResearcher(domain, client=app.state.http)
+        task = asyncio.create_task(researcher.research_company())
+        _research_inflight[key] = task
+        task.add_done_callback(lambda _: _research_inflight.pop(key, None))
+    else:
+        logger.info("Joining in-flight research for domain: %s", domain)
+    return await asyncio.shield(task)
+
+
+async def enqueue_report_delivery(
+    job_id: str,
+    markdown_text: str,
+    company_name: str,
+    report_kind: str,
+    description_prefix: str,
+    email: str,
+    folder_id: Optional[str],
+):
+    """
+    Hand PDF rendering, Drive upload and email for a report to Celery
+
+    Publishing to the broker blocks, so it runs in a worker thread. The upload
+    happens later in the Celery worker, which cannot reach this process's
+    Drive listing cache; /api/drive-files may miss the new file for up to
+    DRIVE_FILES_CACHE_TTL seconds, which is accepted.
+    """
+    now = datetime.now()
+    pdf_filename = (
+        f"{safe_company_name(company_name)}_{report_kind}_{now:%Y%m%d_%H%M%S}.pdf"
+    )
+    await asyncio.to_thread(
+        generate_and_deliver.apply_async,
+        kwargs={
+            "markdown_text": markdown_text,
+            "company_name": company_name,
+            "pdf_filename": pdf_filename,
+            "email": email,
+            "folder_id": folder_id,
+            "description": f"{description_prefix} for {company_name} generated on {now:%Y-%m-%d %H:%M:%S}",
+        },
+        task_id=job_id,
+    )
+    logger.info("Queued report delivery job %s for %s", job_id, company_name)
+
+
+async def queue_multi_source_report(
+    job_id: str, domain: str, email: str, folder_id: Optional[str]
+):
+    """Research a domain in-process, then queue its report for delivery"""
+    try:
+        research_result = await research_company_once(domain)
+        await enqueue_report_delivery(
+            job_id,
+            research_result["report"],
+            research_result["company_name"],
+            "multi_source_report",
+            "Multi-source company research report",
+            email,
+            folder_id,
+        )
+    except Exception as e:
+        logger.error("Multi-source research job %s failed: %s", job_id, str(e))
+
+
+async def queue_coresignal_report(
+    job_id: str, website: str, email: str, folder_id: Optional[str]
+):
+    """Generate a CoreSignal report in-process, then queue it for delivery"""
+    try:
+        coresignal_api = CoreSignalMultiSourceAPI(website, client=app.state.http)
+        api_response = await coresignal_api.company_multi_source_enrich_async()
+        markdown_report = await coresignal_api.generate_markdown_report_with_llm_async(
+            api_response
+        )
+        await enqueue_report_delivery(
+            job_id,
+            markdown_report,
+            api_response.get("company_name", "Unknown_Company"),
+            "coresignal_report",
+            "Company research report",
+            email,
+            folder_id,
+        )
+    except Exception as e:
+        logger.error("CoreSignal report job %s failed: %s", job_id, str(e))
+
+
+def safe_company_name(company_name: str) -> str:
+    """Strip characters that are unsafe in filenames and replace spaces"""
+    return _UNSAFE_FILENAME_CHARS.sub("", company_name).replace(" ", "_")
+
+
+async def convert_markdown_with_pandoc(markdown_text: str) -> bytes:
+    """Pipe the markdown through pandoc without blocking the event loop"""
+    logger.info("Converting markdown to PDF with pandoc...")
+    simple_cmd = ["pandoc", "-f", "markdown", "-t", "pdf", "-o", "-"]
+    proc = await asyncio.create_subprocess_exec(
+        *simple_cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate(markdown_text.encode("utf-8"))
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, simple_cmd, output=stdout, stderr=stderr
+        )
+    return stdout
+
+
+async def generate_pdf(markdown_text: str) -> bytes:
+    """
+    Convert a markdown report to PDF
+
+    Uses the in-process WeasyPrint renderer in the worker process pool when
+    available, otherwise runs pandoc as an async subprocess. With PDF_OPTIMIZE
+    set, the result is then recompressed in the pool as well.
+    """
+    loop = asyncio.get_running_loop()
+    if PDF_RENDERER_AVAILABLE:
+        logger.info("Converting markdown to PDF in-process...")
+        pdf_bytes = await loop.run_in_executor(
+            app.state.pdf_pool, render_markdown_to_pdf, markdown_text
+        )
+    else:
+        pdf_bytes = await convert_markdown_with_pandoc(markdown_text)
+
+    if PDF_OPTIMIZER_AVAILABLE:
+        pdf_bytes = await loop.run_in_executor(
+            app.state.pdf_pool, optimize_pdf, pdf_bytes
+        )
+    return pdf_bytes
+
+
+class CoreSignalCompanyResearchRequest(msgspec.Struct):
     website: str  # e.g., "https://www.example.com" or "example.com"
     email: Optional[str] = None  # Optional: email to send the report
     upload_to_drive: bool = False  # Optional: upload PDF to Google Drive
-    upload_to_drive_folder_id: Optional[str] = Field(
+    upload_to_drive_folder_id: Optional[str] = msgspec.field(
         default_factory=lambda: os.getenv("GOOGLE_DRIVE_FOLDER_ID")
     )  # Optional: upload PDF to Google Drive folder
 
 
-class BackgroundCompanyResearchRequest(BaseModel):
+class BackgroundCompanyResearchRequest(msgspec.Struct):
     website: str  # e.g., "https://www.example.com" or "example.com"
     email: str  # Required: email to send the report
 
 
-class MultiSourceBackgroundCompanyResearchRequest(BaseModel):
+class MultiSourceBackgroundCompanyResearchRequest(msgspec.Struct):
     website: str  # Company domain for Apollo API (e.g., example.com)
     email: str  # Required: email to send the report
 
 
-class MultiSourceCompanyResearchRequest(BaseModel):
+class MultiSourceCompanyResearchRequest(msgspec.Struct):
     domain: str  # Company domain for Apollo API (e.g., example.com)
     email: Optional[str] = None  # Optional: email to send the report
     return_data: bool = False  # Whether to return raw data in response
     upload_to_drive: bool = False  # Optional: upload PDF to Google Drive
-    upload_to_drive_folder_id: Optional[str] = Field(
+    upload_to_drive_folder_id: Optional[str] = msgspec.field(
         default_factory=lambda: os.getenv("GOOGLE_DRIVE_FOLDER_ID")
     )  # Optional: upload PDF to Google Drive folder
 
 
+def msgspec_body(struct_type: type[msgspec.Struct]):
+    """Build a dependency that decodes and validates a JSON request body with msgspec"""
+
+    async def parse_body(request: Request):
+        try:
+            return msgspec.json.decode(await request.body(), type=struct_type)
+        except msgspec.ValidationError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+
+    return parse_body
+
+
+def msgspec_openapi(struct_type: type[msgspec.Struct]) -> dict:
+    """Describe a msgspec request body in the OpenAPI schema"""
+    _, components = msgspec.json.schema_components([struct_type])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": components[struct_type.__name__]}
+            },
+        }
+    }
+
+
 @app.get("/")
 async def root():
     """Serve the frontend interface"""
-    try:
-        from fastapi.responses import HTMLResponse
-
-        with open("static/index.html", "r") as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content, status_code=200)
-    except FileNotFoundError:
+    if app.state.index_html is not None:
+        return HTMLResponse(content=app.state.index_html, status_code=200)
+    else:
         # Fallback to API info if frontend file doesn't exist
         return {
             "message": "Company Research Multi-Source API with CoreSignal, Apollo & Tavily",
@@ -173,34 +517,41 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    email_configured = False
-    if EMAIL_SERVICE_AVAILABLE and EmailService:
-        try:
-            email_service = EmailService()
-            email_configured = email_service.is_configured()
-        except Exception:
-            email_configured = False
+    email_configured = bool(app.state.email and app.state.email.is_configured())
 
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "api_availability": {
-            "coresignal": bool(os.getenv("CORESIGNAL_API_KEY")),
-            "apollo": bool(os.getenv("APOLLO_API_KEY")),
-            "tavily": bool(os.getenv("TAVILY_API_KEY")),
-            "openai": bool(os.getenv("OPENAI_API_KEY")),
-        },
+        "api_availability": API_AVAILABILITY,
         "google_drive_available": GOOGLE_DRIVE_AVAILABLE,
         "email_service_available": EMAIL_SERVICE_AVAILABLE,
         "email_configured": email_configured,
-        "service_account_exists": os.path.exists("service_account.json"),
+        "service_account_exists": SERVICE_ACCOUNT_EXISTS,
         "uploader_module_available": GOOGLE_DRIVE_AVAILABLE,
     }
 
 
-@app.post("/api/multi-source-research-background")
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Report the state of a queued report delivery job
+
+    The state is PENDING until research finishes and the job reaches the queue.
+    """
+    if not CELERY_ENABLED:
+        raise HTTPException(status_code=404, detail="Task queue is not configured")
+    return MsgspecJSONResponse(content=await asyncio.to_thread(job_status, job_id))
+
+
+@app.post(
+    "/api/multi-source-research-background",
+    openapi_extra=msgspec_openapi(MultiSourceBackgroundCompanyResearchRequest),
+)
 async def multi_source_research_background(
-    request: MultiSourceBackgroundCompanyResearchRequest,
+    background_tasks: BackgroundTasks,
+    request: MultiSourceBackgroundCompanyResearchRequest = Depends(
+        msgspec_body(MultiSourceBackgroundCompanyResearchRequest)
+    ),
 ):
     """
     Generate a multi-source research PDF report in background and send via email
@@ -219,9 +570,23 @@ async def multi_source_research_background(
             request.website,
         )
 
-        # Start the background task
-        asyncio.create_task(
-            multi_source_research_endpoint(
+        job_id = None
+        if CELERY_ENABLED:
+            # Research runs here; PDF, Drive and email are handled by workers
+            job_id = str(uuid.uuid4())
+            background_tasks.add_task(
+                queue_multi_source_report,
+                job_id,
+                domain,
+                request.email,
+                os.getenv("GOOGLE_DRIVE_INTERFACE_FOLDER_ID"),
+            )
+        else:
+            # Schedule the background task to run after the response is sent.
+            # The request struct is built from server-side values, and msgspec
+            # only validates on decode, so constructing it here skips validation.
+            background_tasks.add_task(
+                multi_source_research_endpoint,
                 MultiSourceCompanyResearchRequest(
                     domain=domain,
                     email=request.email,
@@ -230,12 +595,11 @@ async def multi_source_research_background(
                     upload_to_drive_folder_id=os.getenv(
                         "GOOGLE_DRIVE_INTERFACE_FOLDER_ID"
                     ),
-                )
+                ),
             )
-        )
 
         # Return immediate success response
-        return JSONResponse(
+        return MsgspecJSONResponse(
             content={
                 "message": "🎉 Multi-source research started! You'll receive an email when it's ready.",
                 "status": "processing",
@@ -243,6 +607,7 @@ async def multi_source_research_background(
                 "email": request.email,
                 "timestamp": datetime.now().isoformat(),
                 "estimated_time": "5-10 minutes",
+                "job_id": job_id,
             }
         )
 
@@ -253,8 +618,15 @@ async def multi_source_research_background(
         )
 
 
-@app.post("/api/multi-source-research")
-async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequest):
+@app.post(
+    "/api/multi-source-research",
+    openapi_extra=msgspec_openapi(MultiSourceCompanyResearchRequest),
+)
+async def multi_source_research_endpoint(
+    request: MultiSourceCompanyResearchRequest = Depends(
+        msgspec_body(MultiSourceCompanyResearchRequest)
+    ),
+):
     """
     Multi-source company research using Apollo API and Tavily Search (replicates main.py functionality)
     """
@@ -264,12 +636,9 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
             request.domain,
         )
 
-        # Initialize MultiSourceResearcher
-        researcher = MultiSourceResearcher(request.domain)
-
-        # Perform complete research using the new class
+        # Perform complete research, sharing any identical run already in flight
         logger.info("Performing comprehensive research...")
-        research_result = await researcher.research_company()
+        research_result = await research_company_once(request.domain)
 
         # Extract data from research result
         report = research_result["report"]
@@ -283,33 +652,18 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
         # Always generate PDF for multi-source research
         logger.info("Generating PDF from report...")
 
-        # Create temporary markdown file
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".md", delete=False
-        ) as md_file:
-            md_file.write(report)
-            md_path = md_file.name
-
         # Generate PDF filename
-        safe_company_name = "".join(
-            c for c in company_name if c.isalnum() or c in (" ", "-", "_")
-        ).replace(" ", "_")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_filename = f"{safe_company_name}_multi_source_report_{timestamp}.pdf"
-
-        # Create temporary PDF file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
-            pdf_path = pdf_file.name
-
-        logger.info("Converting markdown to PDF with pandoc...")
-        # Convert markdown to PDF using pandoc
-        simple_cmd = ["pandoc", md_path, "-o", pdf_path]
-        subprocess.run(simple_cmd, check=True)
+        safe_name = safe_company_name(company_name)
+        # One timestamp per report keeps the filename, Drive description and
+        # response consistent
+        now = datetime.now()
+        generated_at = now.isoformat()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        pdf_filename = f"{safe_name}_multi_source_report_{timestamp}.pdf"
+
+        pdf_bytes = await generate_pdf(report)
         logger.info("PDF generated successfully")
 
-        # Clean up markdown file
-        os.unlink(md_path)
-
         # Handle Google Drive upload if requested
         drive_result = None
         if request.upload_to_drive:
@@ -332,15 +686,20 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
             else:
                 logger.info("Uploading to Google Drive...")
                 try:
-                    uploader = GoogleDriveUploader()  # type: ignore
-                    description = f"Multi-source company research report for {company_name} generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    uploader = app.state.drive
+                    if uploader is None:
+                        raise RuntimeError(
+                            "Google Drive uploader failed to initialize. Check service_account.json"
+                        )
+                    description = f"Multi-source company research report for {company_name} generated on {now:%Y-%m-%d %H:%M:%S}"
 
                     # Upload using the existing uploader
-                    upload_result = uploader.upload_file(
-                        file_path=pdf_path,
+                    upload_result = await uploader.upload_bytes_async(
+                        app.state.http,
+                        pdf_bytes,
+                        filename=pdf_filename,
                         folder_id=request.upload_to_drive_folder_id,
                         description=description,
-                        filename=pdf_filename,
                     )
 
                     if upload_result:
@@ -355,6 +714,8 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                             "Successfully uploaded to Google Drive: %s",
                             drive_result["view_link"],
                         )
+                        # The folder contents changed, drop stale listings
+                        _drive_files_cache.clear()
                     else:
                         drive_result = {
                             "success": False,
@@ -368,9 +729,9 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
 
         # Handle email sending if requested
         email_result = None
-        if request.email and EMAIL_SERVICE_AVAILABLE and EmailService:
+        if request.email and app.state.email:
             try:
-                email_service = EmailService()
+                email_service = app.state.email
                 if email_service.is_configured():
                     logger.info("Sending email to: %s", request.email)
                     drive_link = (
@@ -378,12 +739,13 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                         if drive_result and drive_result.get("success")
                         else None
                     )
-                    email_result = email_service.send_pdf_report(
+                    email_result = await email_service.send_pdf_report(
                         to_email=request.email,
                         company_name=company_name,
-                        pdf_path=pdf_path,
+                        pdf_path=None,
                         pdf_filename=pdf_filename,
                         drive_link=drive_link,
+                        pdf_bytes=pdf_bytes,
                     )
                     logger.info("Email result: %s", email_result)
                 else:
@@ -406,7 +768,7 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                 "company_name": company_name,
                 "domain": request.domain,
                 "pdf_filename": pdf_filename,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": generated_at,
                 "data_sources": ["Apollo Organization API", "Tavily Search API"],
                 "email_sent": email_result.get("success", False)
                 if email_result
@@ -427,16 +789,7 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                     "coresignal_data": coresignal_data,
                 }
 
-            # Clean up the temporary PDF file if email was sent successfully or uploaded to drive
-            if (email_result and email_result.get("success")) or (
-                drive_result and drive_result.get("success")
-            ):
-                try:
-                    os.unlink(pdf_path)
-                except Exception:
-                    pass
-
-            return JSONResponse(content=response_data)
+            return MsgspecJSONResponse(content=response_data)
 
         elif drive_result and drive_result.get("success"):
             # Return JSON response with Google Drive link
@@ -445,7 +798,7 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                 "company_name": company_name,
                 "domain": request.domain,
                 "pdf_filename": pdf_filename,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": generated_at,
                 "data_sources": ["Apollo Organization API", "Tavily Search API"],
                 "google_drive": drive_result,
             }
@@ -458,13 +811,7 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                     "coresignal_data": coresignal_data,
                 }
 
-            # Clean up the temporary PDF file since it's now on Drive
-            try:
-                os.unlink(pdf_path)
-            except Exception:
-                pass
-
-            return JSONResponse(content=response_data)
+            return MsgspecJSONResponse(content=response_data)
 
         else:
             # Return the PDF file as download
@@ -476,11 +823,9 @@ async def multi_source_research_endpoint(request: MultiSourceCompanyResearchRequ
                     "error", "Unknown error"
                 )
 
-            return FileResponse(
-                path=pdf_path,
-                filename=pdf_filename,
-                media_type="application/pdf",
-                headers=headers,
+            # Serve the in-memory PDF directly, nothing is written to disk
+            return Response(
+                content=pdf_bytes, media_type="application/pdf", headers=headers
             )
 
     except subprocess.CalledProcessError as e:
@@ -508,9 +853,12 @@ async def list_drive_files(folder_id: Optional[str] = None):
         )
 
     try:
-        from drive_uploader_complete import GoogleDriveUploader
-
-        uploader = GoogleDriveUploader()
+        uploader = app.state.drive
+        if uploader is None:
+            raise HTTPException(
+                status_code=500,
+                detail="Google Drive uploader failed to initialize. Check service_account.json",
+            )
 
         # Use provided folder_id or default from environment
         target_folder_id = folder_id or os.getenv("GOOGLE_DRIVE_INTERFACE_FOLDER_ID")
@@ -521,6 +869,11 @@ async def list_drive_files(folder_id: Optional[str] = None):
                 detail="No folder ID provided and GOOGLE_DRIVE_FOLDER_ID environment variable is not set",
             )
 
+        cached = _drive_files_cache.get(target_folder_id)
+        if cached and time.monotonic() - cached[0] < DRIVE_FILES_CACHE_TTL:
+            logger.info("Serving cached Drive listing for folder: %s", target_folder_id)
+            return MsgspecJSONResponse(content=cached[1])
+
         # Get files from the folder using direct API call for more fields
         if uploader.service is None:
             raise HTTPException(
@@ -528,57 +881,57 @@ async def list_drive_files(folder_id: Optional[str] = None):
             )
 
         query = f"'{target_folder_id}' in parents"
-        results = (
-            uploader.service.files()
-            .list(
-                q=query,
-                pageSize=100,
-                fields="nextPageToken, files(id, name, mimeType, size, modifiedTime, createdTime, webViewLink, webContentLink)",
-            )
-            .execute()
-        )
 
-        files = results.get("files", [])
+        def list_folder_files() -> list:
+            # Runs every page on one worker thread so they all reuse that
+            # thread's authorized transport and its open TLS connection
+            http = uploader.thread_http()
+            files = []
+            page_token = None
+            while True:
+                results = (
+                    uploader.service.files()
+                    .list(
+                        q=query,
+                        pageSize=1000,
+                        pageToken=page_token,
+                        fields=DRIVE_LIST_FIELDS,
+                    )
+                    .execute(http=http, num_retries=uploader.API_RETRIES)
+                )
 
-        if files is None or not isinstance(files, list):
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve files from Google Drive",
-            )
+                page_files = results.get("files", [])
+                if page_files is None or not isinstance(page_files, list):
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Failed to retrieve files from Google Drive",
+                    )
+                files.extend(page_files)
+
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    return files
+
+        files = await asyncio.to_thread(list_folder_files)
 
         # Format the response
         response_data = {
             "folder_id": target_folder_id,
             "file_count": len(files),
-            "files": [],
+            "files": [
+                {field: file.get(field) for field in DRIVE_FILE_FIELDS}
+                for file in files
+            ],
         }
 
-        for file in files:
-            file_info = {
-                "id": file.get("id"),
-                "name": file.get("name"),
-                "mimeType": file.get("mimeType"),
-                "size": file.get("size"),
-                "createdTime": file.get("createdTime"),
-                "modifiedTime": file.get("modifiedTime"),
-                "webViewLink": file.get("webViewLink"),
-                "webContentLink": file.get("webContentLink"),
-            }
-            response_data["files"].append(file_info)
-
         logger.info(
             "Retrieved %d files from Google Drive folder: %s",
             len(files),
             target_folder_id,
         )
-        return JSONResponse(content=response_data)
+        _drive_files_cache[target_folder_id] = (time.monotonic(), response_data)
+        return MsgspecJSONResponse(content=response_data)
 
-    except ImportError as e:
-        logger.error("Google Drive uploader import error: %s", str(e))
-        raise HTTPException(
-            status_code=500,
-            detail="Google Drive uploader module not available",
-        )
     except Exception as e:
         logger.error("Error listing Google Drive files: %s", str(e))
         raise HTTPException(
@@ -695,8 +1048,16 @@ async def list_drive_files(folder_id: Optional[str] = None):
 #         raise HTTPException(status_code=500, detail=f"Error uploading PDF: {str(e)}")
 
 
-@app.post("/api/coresignal/generate-pdf-background")
-async def coresignal_generate_pdf_background(request: BackgroundCompanyResearchRequest):
+@app.post(
+    "/api/coresignal/generate-pdf-background",
+    openapi_extra=msgspec_openapi(BackgroundCompanyResearchRequest),
+)
+async def coresignal_generate_pdf_background(
+    background_tasks: BackgroundTasks,
+    request: BackgroundCompanyResearchRequest = Depends(
+        msgspec_body(BackgroundCompanyResearchRequest)
+    ),
+):
     """
     Generate a PDF report for a company using CoreSignal API in background and send via email
     Returns immediately with success message while processing continues in background
@@ -704,9 +1065,23 @@ async def coresignal_generate_pdf_background(request: BackgroundCompanyResearchR
     try:
         logger.info("Starting background PDF generation for: %s", request.website)
 
-        # Start the background task
-        asyncio.create_task(
-            coresignal_generate_pdf_report(
+        job_id = None
+        if CELERY_ENABLED:
+            # Report text is generated here; PDF, Drive and email run on workers
+            job_id = str(uuid.uuid4())
+            background_tasks.add_task(
+                queue_coresignal_report,
+                job_id,
+                request.website,
+                request.email,
+                os.getenv("GOOGLE_DRIVE_INTERFACE_FOLDER_ID"),
+            )
+        else:
+            # Schedule the background task to run after the response is sent.
+            # The request struct is built from server-side values, and msgspec
+            # only validates on decode, so constructing it here skips validation.
+            background_tasks.add_task(
+                coresignal_generate_pdf_report,
                 CoreSignalCompanyResearchRequest(
                     website=request.website,
                     email=request.email,
@@ -714,12 +1089,11 @@ async def coresignal_generate_pdf_background(request: BackgroundCompanyResearchR
                     upload_to_drive_folder_id=os.getenv(
                         "GOOGLE_DRIVE_INTERFACE_FOLDER_ID"
                     ),
-                )
+                ),
             )
-        )
 
         # Return immediate success response
-        return JSONResponse(
+        return MsgspecJSONResponse(
             content={
                 "message": "🎉 Report generation started! You'll receive an email when it's ready.",
                 "status": "processing",
@@ -727,6 +1101,7 @@ async def coresignal_generate_pdf_background(request: BackgroundCompanyResearchR
                 "email": request.email,
                 "timestamp": datetime.now().isoformat(),
                 "estimated_time": "5-10 minutes",
+                "job_id": job_id,
             }
         )
 
@@ -737,8 +1112,15 @@ async def coresignal_generate_pdf_background(request: BackgroundCompanyResearchR
         )
 
 
-@app.post("/api/coresignal/generate-pdf")
-async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchRequest):
+@app.post(
+    "/api/coresignal/generate-pdf",
+    openapi_extra=msgspec_openapi(CoreSignalCompanyResearchRequest),
+)
+async def coresignal_generate_pdf_report(
+    request: CoreSignalCompanyResearchRequest = Depends(
+        msgspec_body(CoreSignalCompanyResearchRequest)
+    ),
+):
     """
     Generate a PDF report for a company using CoreSignal API and optionally upload to Google Drive
     """
@@ -752,47 +1134,31 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
         logger.info("Upload to Drive: %s", request.upload_to_drive)
 
         # Initialize CoreSignal API
-        coresignal_api = CoreSignalMultiSourceAPI(website)
+        coresignal_api = CoreSignalMultiSourceAPI(website, client=app.state.http)
 
         # Get API data
         logger.info("Fetching data from CoreSignal API...")
-        api_response = await asyncio.to_thread(
-            coresignal_api.company_multi_source_enrich
-        )
+        api_response = await coresignal_api.company_multi_source_enrich_async()
 
         # Generate markdown report using LLM
         logger.info("Generating markdown report with LLM...")
-        markdown_report = coresignal_api.generate_markdown_report_with_llm(api_response)
-
-        # Create temporary files
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".md", delete=False
-        ) as md_file:
-            md_file.write(markdown_report)
-            md_path = md_file.name
+        markdown_report = await coresignal_api.generate_markdown_report_with_llm_async(
+            api_response
+        )
 
         # Generate PDF filename
         company_name = api_response.get("company_name", "Unknown_Company")
-        safe_company_name = "".join(
-            c for c in company_name if c.isalnum() or c in (" ", "-", "_")
-        ).replace(" ", "_")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        pdf_filename = f"{safe_company_name}_coresignal_report_{timestamp}.pdf"
-
-        # Create temporary PDF file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
-            pdf_path = pdf_file.name
-
-        logger.info("Converting markdown to PDF with pandoc...")
-
-        # Convert markdown to PDF using pandoc
-        simple_cmd = ["pandoc", md_path, "-o", pdf_path]
-        subprocess.run(simple_cmd, check=True)
+        safe_name = safe_company_name(company_name)
+        # One timestamp per report keeps the filename, Drive description and
+        # response consistent
+        now = datetime.now()
+        generated_at = now.isoformat()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        pdf_filename = f"{safe_name}_coresignal_report_{timestamp}.pdf"
+
+        pdf_bytes = await generate_pdf(markdown_report)
         logger.info("PDF generated successfully")
 
-        # Clean up markdown file
-        os.unlink(md_path)
-
         # Handle Google Drive upload if requested
         drive_result = None
         if request.upload_to_drive:
@@ -815,15 +1181,20 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
             else:
                 logger.info("Uploading to Google Drive...")
                 try:
-                    uploader = GoogleDriveUploader()  # type: ignore
-                    description = f"Company research report for {company_name} generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    uploader = app.state.drive
+                    if uploader is None:
+                        raise RuntimeError(
+                            "Google Drive uploader failed to initialize. Check service_account.json"
+                        )
+                    description = f"Company research report for {company_name} generated on {now:%Y-%m-%d %H:%M:%S}"
 
                     # Upload using the existing uploader
-                    upload_result = uploader.upload_file(
-                        file_path=pdf_path,
+                    upload_result = await uploader.upload_bytes_async(
+                        app.state.http,
+                        pdf_bytes,
+                        filename=pdf_filename,
                         folder_id=request.upload_to_drive_folder_id,
                         description=description,
-                        filename=pdf_filename,
                     )
 
                     if upload_result:
@@ -838,6 +1209,8 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
                             "Successfully uploaded to Google Drive: %s",
                             drive_result["view_link"],
                         )
+                        # The folder contents changed, drop stale listings
+                        _drive_files_cache.clear()
                     else:
                         drive_result = {
                             "success": False,
@@ -851,9 +1224,9 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
 
         # Handle email sending if requested
         email_result = None
-        if request.email and EMAIL_SERVICE_AVAILABLE and EmailService:
+        if request.email and app.state.email:
             try:
-                email_service = EmailService()
+                email_service = app.state.email
                 if email_service.is_configured():
                     logger.info("Sending email to: %s", request.email)
                     drive_link = (
@@ -861,12 +1234,13 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
                         if drive_result and drive_result.get("success")
                         else None
                     )
-                    email_result = email_service.send_pdf_report(
+                    email_result = await email_service.send_pdf_report(
                         to_email=request.email,
                         company_name=company_name,
-                        pdf_path=pdf_path,
+                        pdf_path=None,
                         pdf_filename=pdf_filename,
                         drive_link=drive_link,
+                        pdf_bytes=pdf_bytes,
                     )
                     logger.info("Email result: %s", email_result)
                 else:
@@ -888,7 +1262,7 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
                 "message": "PDF generated successfully",
                 "pdf_filename": pdf_filename,
                 "company_name": company_name,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "email_sent": email_result.get("success", False)
                 if email_result
                 else False,
@@ -900,16 +1274,7 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
             if email_result:
                 response_data["email_result"] = email_result
 
-            # Clean up the temporary PDF file if email was sent successfully or uploaded to drive
-            if (email_result and email_result.get("success")) or (
-                drive_result and drive_result.get("success")
-            ):
-                try:
-                    os.unlink(pdf_path)
-                except Exception:
-                    pass
-
-            return JSONResponse(content=response_data)
+            return MsgspecJSONResponse(content=response_data)
 
         elif drive_result and drive_result.get("success"):
             # Return JSON response with Google Drive link
@@ -917,17 +1282,11 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
                 "message": "PDF generated and uploaded to Google Drive successfully",
                 "pdf_filename": pdf_filename,
                 "company_name": company_name,
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": generated_at,
                 "google_drive": drive_result,
             }
 
-            # Clean up the temporary PDF file since it's now on Drive
-            try:
-                os.unlink(pdf_path)
-            except Exception:
-                pass
-
-            return JSONResponse(content=response_data)
+            return MsgspecJSONResponse(content=response_data)
 
         else:
             # Return the PDF file as download
@@ -939,11 +1298,9 @@ async def coresignal_generate_pdf_report(request: CoreSignalCompanyResearchReque
                     "error", "Unknown error"
                 )
 
-            return FileResponse(
-                path=pdf_path,
-                filename=pdf_filename,
-                media_type="application/pdf",
-                headers=headers,
+            # Serve the in-memory PDF directly, nothing is written to disk
+            return Response(
+                content=pdf_bytes, media_type="application/pdf", headers=headers
             )
 
     except subprocess.CalledProcessError as e:
@@ -1002,4 +1359,15 @@ if __name__ == "__main__":
                 "Place 'service_account.json' in the root directory of the project."
             )
 
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Workers re-import this module by name, so every process builds its own
+    # clients, uploader and PDF pool in the lifespan rather than sharing them
+    os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1))
+    uvicorn.run(
+        "company_research_fastapi:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=8080,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ["WEB_CONCURRENCY"]),
+    )
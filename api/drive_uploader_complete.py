@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
+import asyncio
+import io
 import json
+import logging
+import mimetypes
 import os
+import random
 import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import httpx
+
 try:
+    import httplib2
+    from google.auth.transport.requests import Request as AuthRequest
     from google.oauth2.service_account import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 except ImportError as e:
     print("❌ Missing required Google API libraries!")
     print("📦 Please install them with:")
@@ -17,6 +31,38 @@ except ImportError as e:
     print(f"\nError: {e}")
     sys.exit(1)
 
+logger = logging.getLogger(__name__)
+
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+# Reasons in a 403 error body that mean "slow down" rather than "forbidden"
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+# Upload MIME types by lowercase file extension; anything else falls back to
+# the mimetypes module
+MIME_TYPES = {
+    ".py": "text/x-python",
+    ".txt": "text/plain",
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".ppt": "application/vnd.ms-powerpoint",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".md": "text/markdown",
+    ".zip": "application/zip",
+}
+
 
 class GoogleDriveUploader:
     """
@@ -25,6 +71,21 @@ class GoogleDriveUploader:
 
     SCOPES = ["https://www.googleapis.com/auth/drive.file"]
 
+    # Files below this size go up in a single multipart request; larger files use
+    # a resumable session, which costs an extra round trip to initiate
+    SIMPLE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024
+    RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
+    # Retries for rate-limit (403/429) and 5xx responses; googleapiclient backs
+    # off exponentially with jitter between attempts
+    API_RETRIES = 5
+
+    # Maximum sub-requests the Drive batch endpoint accepts per HTTP request
+    BATCH_SIZE = 100
+
+    # Socket timeout in seconds for Drive API connections
+    HTTP_TIMEOUT = 30
+
     def __init__(self, service_account_file="service_account.json"):
         """
         Initialize the Google Drive uploader with Service Account
@@ -34,6 +95,9 @@ class GoogleDriveUploader:
         """
         self.service_account_file = service_account_file
         self.service = None
+        self.credentials = None
+        # Per-thread HTTP transports, reused across uploads on the same thread
+        self._local = threading.local()
         self._authenticate()
 
     def _authenticate(self):
@@ -56,16 +120,44 @@ class GoogleDriveUploader:
         except (json.JSONDecodeError, KeyError) as e:
             raise ValueError(f"Invalid JSON file: {e}")
 
-        print("🔐 Authenticating with Service Account...")
+        logger.debug(
+            "Authenticating with service account %s", self.service_account_file
+        )
 
         # Create credentials from service account file
-        credentials = Credentials.from_service_account_file(
+        self.credentials = Credentials.from_service_account_file(
             self.service_account_file, scopes=self.SCOPES
         )
 
-        # Build the service
-        self.service = build("drive", "v3", credentials=credentials)
-        print("✅ Successfully authenticated with Service Account")
+        # Build the service on an explicit keep-alive transport with a timeout
+        # Use the discovery document bundled with the client library instead of
+        # fetching it, and skip the on-disk discovery cache
+        self.service = build(
+            "drive",
+            "v3",
+            http=self.authorized_http(),
+            static_discovery=True,
+            cache_discovery=False,
+        )
+        logger.info("Authenticated with Google Drive service account")
+
+    def authorized_http(self):
+        """
+        Create a new authorized HTTP transport for executing requests
+
+        The service's own httplib2 transport is not thread-safe, so requests
+        executed from worker threads should each pass a transport from here.
+        """
+        return AuthorizedHttp(
+            self.credentials, http=httplib2.Http(timeout=self.HTTP_TIMEOUT)
+        )
+
+    def thread_http(self):
+        """Return this thread's authorized transport, creating it on first use"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self.authorized_http()
+        return http
 
     def upload_file(self, file_path, folder_id=None, description=None, filename=None):
         """
@@ -85,51 +177,280 @@ class GoogleDriveUploader:
             if not file_path.exists():
                 raise FileNotFoundError(f"File '{file_path}' not found")
 
-            # File metadata
-            file_metadata: dict = {
-                "name": filename if filename else file_path.name,
-            }
-
-            if description:
-                file_metadata["description"] = description
-            if folder_id:
-                file_metadata["parents"] = [folder_id]
-
             # Determine MIME type based on file extension
             mime_type = self._get_mime_type(file_path.suffix)
 
-            media = MediaFileUpload(str(file_path), mimetype=mime_type, resumable=True)
+            if file_path.stat().st_size < self.SIMPLE_UPLOAD_MAX_BYTES:
+                media = MediaIoBaseUpload(
+                    io.BytesIO(file_path.read_bytes()),
+                    mimetype=mime_type,
+                    resumable=False,
+                )
+            else:
+                media = MediaFileUpload(
+                    str(file_path),
+                    mimetype=mime_type,
+                    chunksize=self.RESUMABLE_CHUNK_SIZE,
+                    resumable=True,
+                )
 
-            upload_name = filename if filename else file_path.name
-            print(f"📤 Uploading '{upload_name}' to Google Drive...")
-            if self.service is None:
-                raise ValueError("Service not initialized. Call authenticate() first.")
+            return self._create_file(
+                media,
+                filename if filename else file_path.name,
+                folder_id=folder_id,
+                description=description,
+            )
 
-            file = (
-                self.service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields="id,name,webViewLink,size",
+        except HttpError as error:
+            logger.error("Google Drive upload failed: %s", error)
+            return None
+        except Exception as error:
+            logger.error("Unexpected error uploading to Google Drive: %s", error)
+            return None
+
+    def upload_files(
+        self, file_paths, folder_id=None, description=None, max_workers=None
+    ):
+        """
+        Upload several files to Google Drive concurrently
+
+        Args:
+            file_paths (list): Paths of the files to upload
+            folder_id (str, optional): ID of the folder to upload to
+            description (str, optional): Description for every file
+            max_workers (int, optional): Parallel uploads, defaults to the
+                DRIVE_UPLOAD_CONCURRENCY environment variable or 4
+
+        Returns:
+            list: File metadata (or None on failure) for each path, in order
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("DRIVE_UPLOAD_CONCURRENCY", "4"))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.upload_file, path, folder_id=folder_id, description=description
                 )
-                .execute()
-            )
+                for path in file_paths
+            ]
+            return [future.result() for future in futures]
+
+    def upload_bytes(
+        self,
+        data,
+        filename,
+        folder_id=None,
+        description=None,
+        mime_type="application/pdf",
+    ):
+        """
+        Upload in-memory file content to Google Drive without touching disk
 
-            print("✅ File uploaded successfully!")
-            print(f"   📁 Name: {file.get('name')}")
-            print(f"   🆔 File ID: {file.get('id')}")
-            print(f"   🔗 View Link: {file.get('webViewLink')}")
-            print(f"   📊 Size: {file.get('size')} bytes")
+        Args:
+            data (bytes): File content to upload
+            filename (str): Name of the file in Google Drive
+            folder_id (str, optional): ID of the folder to upload to
+            description (str, optional): Description for the file
+            mime_type (str): MIME type of the content
 
-            return file
+        Returns:
+            dict: File metadata from Google Drive
+        """
+        return self.upload_stream(
+            io.BytesIO(data),
+            filename,
+            folder_id=folder_id,
+            description=description,
+            mime_type=mime_type,
+        )
+
+    def upload_stream(
+        self,
+        stream,
+        filename,
+        folder_id=None,
+        description=None,
+        mime_type="application/pdf",
+    ):
+        """
+        Upload the contents of a file-like object to Google Drive
+
+        Small streams go up in a single request and larger ones through a
+        chunked resumable session, so the content is never copied to disk.
+
+        Args:
+            stream (io.IOBase): Seekable binary stream, uploaded from the start
+            filename (str): Name of the file in Google Drive
+            folder_id (str, optional): ID of the folder to upload to
+            description (str, optional): Description for the file
+            mime_type (str): MIME type of the content
+
+        Returns:
+            dict: File metadata from Google Drive
+        """
+        try:
+            size = stream.seek(0, io.SEEK_END) - stream.seek(0)
+            media = MediaIoBaseUpload(
+                stream,
+                mimetype=mime_type,
+                chunksize=self.RESUMABLE_CHUNK_SIZE,
+                resumable=size >= self.SIMPLE_UPLOAD_MAX_BYTES,
+            )
+
+            return self._create_file(
+                media, filename, folder_id=folder_id, description=description
+            )
 
         except HttpError as error:
-            print(f"❌ An error occurred: {error}")
+            logger.error("Google Drive upload failed: %s", error)
+            return None
+        except Exception as error:
+            logger.error("Unexpected error uploading to Google Drive: %s", error)
             return None
+
+    async def upload_bytes_async(
+        self,
+        client,
+        data,
+        filename,
+        folder_id=None,
+        description=None,
+        mime_type="application/pdf",
+    ):
+        """
+        Upload in-memory file content over a shared httpx client
+
+        Small files are sent as one multipart request on the caller's
+        (HTTP/2) connection pool without a worker thread; larger files fall
+        back to the resumable upload in a thread.
+
+        Args:
+            client (httpx.AsyncClient): Client used for the upload request
+            data (bytes): File content to upload
+            filename (str): Name of the file in Google Drive
+            folder_id (str, optional): ID of the folder to upload to
+            description (str, optional): Description for the file
+            mime_type (str): MIME type of the content
+
+        Returns:
+            dict: File metadata from Google Drive
+        """
+        if len(data) >= self.SIMPLE_UPLOAD_MAX_BYTES:
+            return await asyncio.to_thread(
+                self.upload_bytes,
+                data,
+                filename,
+                folder_id=folder_id,
+                description=description,
+                mime_type=mime_type,
+            )
+
+        try:
+            file_metadata = self._file_metadata(filename, folder_id, description)
+            boundary = uuid.uuid4().hex
+            body = (
+                (
+                    f"--{boundary}\r\n"
+                    "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                    f"{json.dumps(file_metadata)}\r\n"
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {mime_type}\r\n\r\n"
+                ).encode("utf-8")
+                + data
+                + f"\r\n--{boundary}--\r\n".encode("utf-8")
+            )
+
+            logger.debug("Uploading '%s' to Google Drive", filename)
+            for attempt in range(self.API_RETRIES + 1):
+                if not self.credentials.valid:
+                    await asyncio.to_thread(self.credentials.refresh, AuthRequest())
+                try:
+                    response = await client.post(
+                        DRIVE_UPLOAD_URL,
+                        params={
+                            "uploadType": "multipart",
+                            "fields": "id,name,webViewLink,size",
+                        },
+                        content=body,
+                        headers={
+                            "Authorization": f"Bearer {self.credentials.token}",
+                            "Content-Type": f"multipart/related; boundary={boundary}",
+                        },
+                    )
+                except httpx.TransportError:
+                    # A dropped connection or stream is retried like a 5xx
+                    if attempt == self.API_RETRIES:
+                        raise
+                else:
+                    if not self._should_retry(response) or attempt == self.API_RETRIES:
+                        break
+                await asyncio.sleep(random.random() * 2**attempt)
+
+            response.raise_for_status()
+            file = response.json()
+            self._log_upload_result(file)
+            return file
+
         except Exception as error:
-            print(f"❌ Unexpected error: {error}")
+            logger.error("Unexpected error uploading to Google Drive: %s", error)
             return None
 
+    @staticmethod
+    def _should_retry(response):
+        """Whether a Drive response is a rate-limit or transient server error"""
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return True
+        if response.status_code != 403:
+            return False
+        try:
+            errors = response.json()["error"]["errors"]
+            return any(error.get("reason") in RATE_LIMIT_REASONS for error in errors)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+    @staticmethod
+    def _file_metadata(upload_name, folder_id=None, description=None):
+        """Build the Drive metadata for a new file"""
+        file_metadata: dict = {"name": upload_name}
+
+        if description:
+            file_metadata["description"] = description
+        if folder_id:
+            file_metadata["parents"] = [folder_id]
+        return file_metadata
+
+    @staticmethod
+    def _log_upload_result(file):
+        logger.info(
+            "Uploaded '%s' to Google Drive (id=%s, %s bytes): %s",
+            file.get("name"),
+            file.get("id"),
+            file.get("size"),
+            file.get("webViewLink"),
+        )
+
+    def _create_file(self, media, upload_name, folder_id=None, description=None):
+        """Create the Drive file for an upload media body and return its metadata"""
+        file_metadata = self._file_metadata(upload_name, folder_id, description)
+
+        logger.debug("Uploading '%s' to Google Drive", upload_name)
+        if self.service is None:
+            raise ValueError("Service not initialized. Call authenticate() first.")
+
+        file = (
+            self.service.files()
+            .create(
+                body=file_metadata,
+                media_body=media,
+                fields="id,name,webViewLink,size",
+            )
+            .execute(http=self.thread_http(), num_retries=self.API_RETRIES)
+        )
+
+        self._log_upload_result(file)
+        return file
+
     def create_folder(self, folder_name, parent_folder_id=None):
         """
         Create a folder in Google Drive
@@ -155,18 +476,97 @@ class GoogleDriveUploader:
             folder = (
                 self.service.files()
                 .create(body=file_metadata, fields="id,name")
-                .execute()
+                .execute(http=self.thread_http(), num_retries=self.API_RETRIES)
             )
 
-            print(f"✅ Folder '{folder_name}' created successfully!")
-            print(f"   🆔 Folder ID: {folder.get('id')}")
+            logger.info("Created folder '%s' (id=%s)", folder_name, folder.get("id"))
 
             return folder.get("id")
 
         except HttpError as error:
-            print(f"❌ An error occurred: {error}")
+            logger.error("Google Drive folder creation failed: %s", error)
             return None
 
+    def create_folders_batch(self, folder_names, parent_folder_id=None):
+        """
+        Create several folders using batched Drive API requests
+
+        Args:
+            folder_names (list): Names of the folders to create
+            parent_folder_id (str, optional): ID of the parent folder
+
+        Returns:
+            list: ID of each created folder (None on failure), in order
+        """
+        if self.service is None:
+            raise ValueError("Service not initialized. Call authenticate() first.")
+
+        requests = []
+        for folder_name in folder_names:
+            file_metadata = {
+                "name": folder_name,
+                "mimeType": "application/vnd.google-apps.folder",
+            }
+            if parent_folder_id:
+                file_metadata["parents"] = [parent_folder_id]
+            requests.append(
+                self.service.files().create(body=file_metadata, fields="id,name")
+            )
+
+        results = self._execute_batch(requests)
+        logger.info(
+            "Created %d of %d folders", sum(1 for r in results if r), len(results)
+        )
+        return [result.get("id") if result else None for result in results]
+
+    def share_files_batch(
+        self, file_ids, role="reader", permission_type="anyone", email=None
+    ):
+        """
+        Grant the same permission on several files using batched requests
+
+        Args:
+            file_ids (list): IDs of the files to share
+            role (str): Permission role, e.g. "reader" or "writer"
+            permission_type (str): Grantee type, e.g. "anyone", "user" or "domain"
+            email (str, optional): Email address for "user"/"group" grantees
+
+        Returns:
+            list: Created permission metadata (None on failure), in order
+        """
+        if self.service is None:
+            raise ValueError("Service not initialized. Call authenticate() first.")
+
+        permission = {"role": role, "type": permission_type}
+        if email:
+            permission["emailAddress"] = email
+
+        requests = [
+            self.service.permissions().create(
+                fileId=file_id, body=permission, fields="id,role,type"
+            )
+            for file_id in file_ids
+        ]
+        return self._execute_batch(requests)
+
+    def _execute_batch(self, requests):
+        """Execute requests in batches of at most BATCH_SIZE sub-requests"""
+        results = [None] * len(requests)
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Batch request %s failed: %s", request_id, exception)
+            else:
+                results[int(request_id)] = response
+
+        for start in range(0, len(requests), self.BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for index in range(start, min(start + self.BATCH_SIZE, len(requests))):
+                batch.add(requests[index], request_id=str(index))
+            batch.execute(http=self.thread_http())
+
+        return results
+
     def list_files(self, folder_id=None, max_results=10):
         """
         List files in Google Drive
@@ -183,7 +583,7 @@ class GoogleDriveUploader:
             if folder_id:
                 query = f"'{folder_id}' in parents"
             if self.service is None:
-                print("❌ Service not initialized")
+                logger.error("Google Drive service not initialized")
                 return []
 
             results = (
@@ -193,26 +593,20 @@ class GoogleDriveUploader:
                     pageSize=max_results,
                     fields="nextPageToken, files(id, name, mimeType, size, modifiedTime)",
                 )
-                .execute()
+                .execute(http=self.thread_http(), num_retries=self.API_RETRIES)
             )
 
             items = results.get("files", [])
 
-            if not items:
-                print("📁 No files found.")
-                return []
-
-            print(f"📁 Found {len(items)} file(s):")
-            for item in items:
-                print(f"   📄 {item['name']} (ID: {item['id']})")
-
+            logger.debug("Found %d file(s) in Google Drive", len(items))
             return items
 
         except HttpError as error:
-            print(f"❌ An error occurred: {error}")
+            logger.error("Google Drive file listing failed: %s", error)
             return []
 
-    def _get_mime_type(self, file_extension):
+    @staticmethod
+    def _get_mime_type(file_extension):
         """
         Get MIME type based on file extension
 
@@ -222,30 +616,17 @@ class GoogleDriveUploader:
         Returns:
             str: MIME type
         """
-        mime_types = {
-            ".py": "text/x-python",
-            ".txt": "text/plain",
-            ".pdf": "application/pdf",
-            ".doc": "application/msword",
-            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            ".xls": "application/vnd.ms-excel",
-            ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            ".ppt": "application/vnd.ms-powerpoint",
-            ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".csv": "text/csv",
-            ".json": "application/json",
-            ".html": "text/html",
-            ".css": "text/css",
-            ".js": "application/javascript",
-            ".md": "text/markdown",
-            ".zip": "application/zip",
-        }
-
-        return mime_types.get(file_extension.lower(), "application/octet-stream")
+        return (
+            MIME_TYPES.get(file_extension.lower())
+            or mimetypes.guess_type(f"file{file_extension}")[0]
+            or "application/octet-stream"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_uploader():
+    """Return the process-wide uploader, authenticating on first use"""
+    return GoogleDriveUploader()
 
 
 def print_setup_instructions():
@@ -415,6 +796,9 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s"
+    )
     try:
         success = main()
         if success:
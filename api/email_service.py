@@ -1,17 +1,123 @@
+import asyncio
 import logging
+import mmap
 import os
-import smtplib
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Optional
 
+import aiosmtplib
+from jinja2 import Environment
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait on each SMTP connect, command and message upload
+SMTP_TIMEOUT = 30
+
+# Largest PDF attached to an email (25MB limit for most email providers)
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+
+# Messages sent over one SMTP session before it is replaced with a fresh one
+SMTP_MAX_MESSAGES_PER_SESSION = 10_000
+
+
+def pdf_attachment(data, filename: str) -> MIMEApplication:
+    """Build a base64-encoded PDF attachment from a bytes-like object"""
+    attach = MIMEApplication(data, _subtype="pdf")
+    attach.add_header("Content-Disposition", "attachment", filename=filename)
+    return attach
+
+
+def pdf_file_attachment(
+    path: str, filename: str
+) -> tuple[Optional[MIMEApplication], int]:
+    """
+    Build a PDF attachment from a file on disk
+
+    The file is opened once: its size comes from fstat on the same descriptor
+    that is then memory-mapped, so the encoder reads from the page cache
+    instead of a second in-memory copy of the raw bytes.
+
+    Returns:
+        The attachment (None when the file is over MAX_ATTACHMENT_BYTES) and
+        the file size
+    """
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size >= MAX_ATTACHMENT_BYTES:
+            return None, file_size
+        if file_size == 0:
+            # An empty file cannot be memory-mapped
+            return pdf_attachment(b"", filename), file_size
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return pdf_attachment(data, filename), file_size
+
+
+# HTML email body; only the company name and Drive link vary between sends
+EMAIL_BODY_TEMPLATE = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        </head>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
+                <h1 style="margin: 0; font-size: 28px;">🏢 Company Research Report</h1>
+                <p style="margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">AI-Powered Business Intelligence</p>
+            </div>
+            
+            <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
+                <h2 style="color: #667eea; margin: 0 0 20px 0;">Report Ready: {{ company_name }}</h2>
+                
+                <p>Your comprehensive company research report has been generated successfully!</p>
+                
+                <div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-radius: 5px; border-left: 4px solid #667eea;">
+                    <h3 style="margin: 0 0 10px 0; color: #495057;">📊 Report Includes:</h3>
+                    <ul style="margin: 0; padding-left: 20px;">
+                        <li>Company overview and key metrics</li>
+                        <li>Recent news and market updates</li>
+                        <li>Major customers and partnerships</li>
+                        <li>Competitive landscape analysis</li>
+                        <li>Financial and growth insights</li>
+                    </ul>
+                </div>
+                
+                {% if drive_link %}
+                <div style="margin: 20px 0; padding: 15px; background-color: #e8f5e8; border-radius: 5px; border-left: 4px solid #28a745;">
+                    <h3 style="margin: 0 0 10px 0; color: #155724;">📁 Google Drive Access</h3>
+                    <p style="margin: 0;">
+                        <a href="{{ drive_link }}" style="color: #007bff; text-decoration: none;">
+                            View Report in Google Drive →
+                        </a>
+                    </p>
+                </div>
+                {% endif %}
+                
+                <div style="margin: 30px 0 20px 0; padding: 15px; background-color: #fff3cd; border-radius: 5px; border-left: 4px solid #ffc107;">
+                    <h3 style="margin: 0 0 10px 0; color: #856404;">⚡ Data Sources</h3>
+                    <p style="margin: 0;">This report combines data from multiple premium sources including CoreSignal, Apollo, and Tavily APIs for comprehensive business intelligence.</p>
+                </div>
+                
+                <hr style="border: none; height: 1px; background-color: #e9ecef; margin: 30px 0;">
+                
+                <div style="text-align: center; color: #6c757d; font-size: 14px;">
+                    <p style="margin: 0;">Generated by Company Research API</p>
+                    <p style="margin: 5px 0 0 0;">Powered by AI and Multi-Source Data Intelligence</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
 
 class EmailService:
     """Simple email service for sending PDF reports"""
 
+    # Compiled once and shared by all instances; values are HTML-escaped
+    BODY_TEMPLATE = Environment(autoescape=True).from_string(EMAIL_BODY_TEMPLATE)
+
     def __init__(self):
         # Email configuration from environment variables
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -20,17 +126,82 @@ class EmailService:
         self.email_password = os.getenv("EMAIL_PASSWORD")
         self.from_email = os.getenv("FROM_EMAIL", self.email_user)
 
+        # Authenticated session shared by all sends, so the TCP/TLS/AUTH
+        # handshake is paid once rather than per email
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._smtp_messages = 0
+        self._smtp_lock = asyncio.Lock()
+
     def is_configured(self) -> bool:
         """Check if email service is properly configured"""
         return bool(self.email_user and self.email_password)
 
-    def send_pdf_report(
+    async def connect(self) -> aiosmtplib.SMTP:
+        """
+        Open a new authenticated SMTP session
+
+        send_pdf_report reuses one session through _get_smtp(); this is the
+        underlying connect/STARTTLS/login.
+        """
+        server = aiosmtplib.SMTP(
+            hostname=self.smtp_server,
+            port=self.smtp_port,
+            start_tls=True,
+            timeout=SMTP_TIMEOUT,
+        )
+        await server.connect()
+        try:
+            await server.login(self.email_user or "", self.email_password or "")
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    async def _get_smtp(self) -> aiosmtplib.SMTP:
+        """
+        Return the shared SMTP session, reconnecting when it is stale
+
+        The session is checked with RSET before reuse, which also clears any
+        state left by a failed transaction. Call with _smtp_lock held.
+        """
+        if self._smtp is not None:
+            if self._smtp_messages < SMTP_MAX_MESSAGES_PER_SESSION:
+                try:
+                    await self._smtp.rset()
+                    return self._smtp
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    logger.info("SMTP session is stale, reconnecting: %s", e)
+            await self._close_smtp()
+
+        self._smtp = await self.connect()
+        self._smtp_messages = 0
+        return self._smtp
+
+    async def _close_smtp(self):
+        """Quit and drop the shared SMTP session, if any"""
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            pass
+        finally:
+            smtp.close()
+
+    async def close(self):
+        """Close the shared SMTP session; called at application shutdown"""
+        async with self._smtp_lock:
+            await self._close_smtp()
+
+    async def send_pdf_report(
         self,
         to_email: str,
         company_name: str,
-        pdf_path: str,
+        pdf_path: Optional[str],
         pdf_filename: str,
         drive_link: Optional[str] = None,
+        pdf_bytes: Optional[bytes] = None,
     ) -> dict:
         """
         Send PDF report via email
@@ -38,9 +209,10 @@ class EmailService:
         Args:
             to_email: Recipient email address
             company_name: Name of the company analyzed
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file (ignored when pdf_bytes is given)
             pdf_filename: Name of the PDF file
             drive_link: Optional Google Drive link
+            pdf_bytes: Optional in-memory PDF content to attach
 
         Returns:
             Dict with success status and message
@@ -74,44 +246,62 @@ class EmailService:
 
             attachments_count = 0
 
-            # Attach PDF if file exists and is not too large (25MB limit for most email providers)
-            if os.path.exists(pdf_path):
-                file_size = os.path.getsize(pdf_path)
+            # Attach the PDF unless it is too large for most email providers.
+            # Base64 encoding a large PDF takes a while, so do it off the loop.
+            attach = None
+            file_size = None
+            if pdf_bytes is not None:
+                file_size = len(pdf_bytes)
                 logger.info(
-                    "PDF file found: %s (size: %.2f MB)",
-                    pdf_path,
+                    "PDF provided in memory (size: %.2f MB)",
                     file_size / (1024 * 1024),
                 )
-
-                if file_size < 25 * 1024 * 1024:  # 25MB limit
-                    with open(pdf_path, "rb") as f:
-                        attach = MIMEApplication(f.read(), _subtype="pdf")
-                        attach.add_header(
-                            "Content-Disposition", "attachment", filename=pdf_filename
-                        )
-                        msg.attach(attach)
-                        attachments_count += 1
-                    logger.info(
-                        "PDF attached to email (size: %.2f MB, attachments: %d)",
-                        file_size / (1024 * 1024),
-                        attachments_count,
+                if file_size < MAX_ATTACHMENT_BYTES:
+                    attach = await asyncio.to_thread(
+                        pdf_attachment, pdf_bytes, pdf_filename
+                    )
+            elif pdf_path:
+                try:
+                    attach, file_size = await asyncio.to_thread(
+                        pdf_file_attachment, pdf_path, pdf_filename
                     )
-                else:
-                    logger.warning(
-                        "PDF too large to attach (%.2f MB), including drive link only",
+                    logger.info(
+                        "PDF file found: %s (size: %.2f MB)",
+                        pdf_path,
                         file_size / (1024 * 1024),
                     )
-            else:
+                except FileNotFoundError:
+                    pass
+
+            if file_size is None:
                 logger.warning("PDF file not found: %s", pdf_path)
+            elif attach is not None:
+                msg.attach(attach)
+                attachments_count += 1
+                logger.info(
+                    "PDF attached to email (size: %.2f MB, attachments: %d)",
+                    file_size / (1024 * 1024),
+                    attachments_count,
+                )
+            else:
+                logger.warning(
+                    "PDF too large to attach (%.2f MB), including drive link only",
+                    file_size / (1024 * 1024),
+                )
 
             logger.info("Email message prepared with %d attachments", attachments_count)
 
             # Send email - we already checked is_configured() so these should not be None
             if self.email_user and self.email_password:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls()
-                    server.login(self.email_user, self.email_password)
-                    server.send_message(msg)
+                async with self._smtp_lock:
+                    server = await self._get_smtp()
+                    try:
+                        await server.send_message(msg)
+                    except Exception:
+                        # Do not reuse a session left in an unknown state
+                        await self._close_smtp()
+                        raise
+                    self._smtp_messages += 1
             else:
                 raise ValueError("Email credentials not configured")
 
@@ -130,62 +320,6 @@ class EmailService:
         self, company_name: str, drive_link: Optional[str] = None
     ) -> str:
         """Create HTML email body"""
-        drive_section = ""
-        if drive_link:
-            drive_section = f"""
-            <div style="margin: 20px 0; padding: 15px; background-color: #e8f5e8; border-radius: 5px; border-left: 4px solid #28a745;">
-                <h3 style="margin: 0 0 10px 0; color: #155724;">📁 Google Drive Access</h3>
-                <p style="margin: 0;">
-                    <a href="{drive_link}" style="color: #007bff; text-decoration: none;">
-                        View Report in Google Drive →
-                    </a>
-                </p>
-            </div>
-            """
-
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        </head>
-        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-                <h1 style="margin: 0; font-size: 28px;">🏢 Company Research Report</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">AI-Powered Business Intelligence</p>
-            </div>
-            
-            <div style="background: white; padding: 30px; border-radius: 0 0 10px 10px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
-                <h2 style="color: #667eea; margin: 0 0 20px 0;">Report Ready: {company_name}</h2>
-                
-                <p>Your comprehensive company research report has been generated successfully!</p>
-                
-                <div style="margin: 20px 0; padding: 15px; background-color: #f8f9fa; border-radius: 5px; border-left: 4px solid #667eea;">
-                    <h3 style="margin: 0 0 10px 0; color: #495057;">📊 Report Includes:</h3>
-                    <ul style="margin: 0; padding-left: 20px;">
-                        <li>Company overview and key metrics</li>
-                        <li>Recent news and market updates</li>
-                        <li>Major customers and partnerships</li>
-                        <li>Competitive landscape analysis</li>
-                        <li>Financial and growth insights</li>
-                    </ul>
-                </div>
-                
-                {drive_section}
-                
-                <div style="margin: 30px 0 20px 0; padding: 15px; background-color: #fff3cd; border-radius: 5px; border-left: 4px solid #ffc107;">
-                    <h3 style="margin: 0 0 10px 0; color: #856404;">⚡ Data Sources</h3>
-                    <p style="margin: 0;">This report combines data from multiple premium sources including CoreSignal, Apollo, and Tavily APIs for comprehensive business intelligence.</p>
-                </div>
-                
-                <hr style="border: none; height: 1px; background-color: #e9ecef; margin: 30px 0;">
-                
-                <div style="text-align: center; color: #6c757d; font-size: 14px;">
-                    <p style="margin: 0;">Generated by Company Research API</p>
-                    <p style="margin: 5px 0 0 0;">Powered by AI and Multi-Source Data Intelligence</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return self.BODY_TEMPLATE.render(
+            company_name=company_name, drive_link=drive_link
+        )
@@ -0,0 +1,41 @@
+import logging
+
+from markdown_it import MarkdownIt
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+logger = logging.getLogger(__name__)
+
+# Parser, font configuration and stylesheet are built once per process so every
+# conversion reuses the parsed CSS and the fontconfig cache.
+_MARKDOWN = MarkdownIt("commonmark").enable("table")
+_FONT_CONFIG = FontConfiguration()
+_STYLESHEET = CSS(
+    string="""
+    @page { size: A4; margin: 2cm; }
+    body { font-family: "DejaVu Serif", serif; font-size: 11pt; line-height: 1.4; }
+    h1, h2, h3 { font-family: "DejaVu Sans", sans-serif; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { border: 1px solid #999; padding: 4px 6px; text-align: left; }
+    a { color: #1a0dab; word-wrap: break-word; }
+    """,
+    font_config=_FONT_CONFIG,
+)
+
+
+def render_markdown_to_pdf(markdown_text: str) -> bytes:
+    """
+    Render a markdown report to PDF in-process
+
+    Args:
+        markdown_text: Markdown source of the report
+
+    Returns:
+        The generated PDF document
+    """
+    html = _MARKDOWN.render(markdown_text)
+    pdf_bytes = HTML(string=html).write_pdf(
+        stylesheets=[_STYLESHEET], font_config=_FONT_CONFIG
+    )
+    logger.info("PDF rendered in-process (%d bytes)", len(pdf_bytes))
+    return pdf_bytes
@@ -0,0 +1 @@
+# Researchers Package
@@ -1,46 +1,200 @@
 import asyncio
-import json
+import heapq
 import logging
 import os
-import sys
-from typing import List
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, List
 
-# Add the parent directory to sys.path to find modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+import httpx
+import msgspec
+from jinja2 import Environment
 
 from search_engines.tavily_search import (
+    TAVILY_RESULTS_ADAPTER,
     TavilySearchResult,
     get_major_competitors_async,
     get_major_customers_async,
     get_recent_news_async,
+    run_company_major_customers_and_news_agent_async,
 )
 from third_party_api.apollo_organization_api import ApolloOrganizationAPI
-from third_party_api.coresignal_multisource_api import CoreSignalMultiSourceAPI
+from third_party_api.coresignal_multisource_api import (
+    CoreSignalMultiSourceAPI,
+    load_company_schema,
+    report_prompt_data,
+)
+from third_party_api.http_client import create_async_client
+from third_party_api.results_dirs import company_slug
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
 
+# Report prompt, compiled once; rendered per report with the research data.
+# keep_trailing_newline keeps the text identical to the former f-string.
+REPORT_PROMPT_TEMPLATE = Environment(keep_trailing_newline=True).from_string(
+    """
+        You are a research assistant specialized in company analysis. Generate a structured, human-readable markdown report for the company: {{ company_name }} using the following data fields and data sources in json format.
+        
+        ## Data fields:
+        Company Overview:
+        - Company Name
+        - Website
+        - Description
+        - Founded Year
+        - Status
+        - Type
+        Industry and Market:
+        - Industry
+        - Keywords
+        Location
+        - HQ and other locations Address, City, State, Country
+        Contact Details -  Emails, Phone no.
+        Leadership & Key Executives:
+        - Name, Title, LinkedIn Profile
+        Employee Insights
+        - Employee Count
+        - Ratings
+        - Employees by Location
+        - Employees by Title
+        - Employee Growth
+        Financials:
+        - Annual Revenue
+        - Recent Financial Performance
+        Funding and Ownership
+        - Funding Rounds
+        - Total Funding
+        - Recent Funding
+        - Private or Public
+        - Investors
+        Competitors:
+        - Name
+        - Revenue and total funding
+        Recent News:
+        - News Title
+        - News Summary
+        - News Date
+        - Source URL
+        Enterprise Customers
+        Online Presence - Website, LinkedIn 
+        - Links
+        - Followers
+        
+        ## Data Sources:
+        Coresignel API: {{ coresignal_json }}
+        Apollo API: {{ apollo_json }}
+        Closest competitors (Coresignel, by similarity score): {{ competitors }}
+
+        ## Major/Enterprise Customers (from Tavily)
+        Data: {{ customers }}
+        ---
+
+        Instructions:
+        - Use only the provided data. Do not fabricate or add any information not present above.
+        - For each section, if data is missing or empty, state "No relevant data found."
+        - Remove duplicates and ensure each entry is unique.
+        - Format the report in clear, well-structured markdown with the above sections. Each section should be a separate markdown heading.
+        - **IMPORTANT** Mention sources for each sections. If it is a link create a markdown link. Mark N/A if no source is available.
+        - Do not include any information not present in the provided data.
+        - Extract the source url from the news item/corresponding company update description and add it to the news item.
+        - For Tavily data, create a markdown link for the source url.
+        - **VERY IMPORTANT: Do NOT include any emojis, special characters, or symbols (such as 👀, 🚀, ✅, 📊, etc.) in the report as they can cause PDF generation issues. Use only standard text, numbers, and basic punctuation.**
+
+        """
+)
+
+
+@lru_cache(maxsize=1)
+def get_llm() -> "ChatOpenAI":
+    """
+    Return the process-wide report LLM, creating it on first use
+
+    Sharing one client lets concurrent research jobs reuse its pooled
+    connections to the OpenAI API. LangChain is imported here rather than at
+    module load because its import tree takes most of a second to load.
+    """
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model="o3")
+
+
+# Top-level field name prefixes of an Apollo organization that the report's
+# "Data fields" draw on. The rest (IDs, logos, tracking data) only adds prompt
+# tokens. Prefixes rather than exact names so field variants are kept too.
+# CoreSignal data is trimmed by report_prompt_data(), shared with its own report.
+APOLLO_PROMPT_FIELDS = (
+    "name",
+    "website_url",
+    "primary_domain",
+    "short_description",
+    "seo_description",
+    "founded_year",
+    "publicly_traded",
+    "industr",
+    "secondary_industries",
+    "keywords",
+    "raw_address",
+    "street_address",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+    "phone",
+    "primary_phone",
+    "sanitized_phone",
+    "estimated_num_employees",
+    "departmental_head_count",
+    "organization_headcount",
+    "annual_revenue",
+    "total_funding",
+    "latest_funding",
+    "funding_events",
+    "linkedin_url",
+    "twitter_url",
+    "facebook_url",
+)
+
+
+def project_fields(data: dict, prefixes: tuple) -> dict:
+    """Keep only the top-level keys that start with one of the prefixes"""
+    return {key: value for key, value in data.items() if key.startswith(prefixes)}
+
+
+def apollo_prompt_data(apollo_data: dict) -> dict:
+    """Trim an Apollo enrichment payload to the fields used by the report prompt"""
+    organization = apollo_data.get("organization")
+    if isinstance(organization, dict):
+        return {"organization": project_fields(organization, APOLLO_PROMPT_FIELDS)}
+    return project_fields(apollo_data, APOLLO_PROMPT_FIELDS)
+
+
+def pretty_json(data) -> str:
+    """Serialize API data as indented JSON for the report prompt"""
+    return msgspec.json.format(msgspec.json.encode(data), indent=2).decode("utf-8")
+
+
 class MultiSourceResearcher:
     """
     Multi-source company researcher that combines Apollo API and Tavily Search
     to generate comprehensive company reports using LLM processing.
     """
 
-    def __init__(self, domain: str):
+    def __init__(self, domain: str, client: httpx.AsyncClient | None = None):
         """
         Initialize the multi-source researcher.
 
         Args:
             domain: Company domain for Apollo API (e.g., example.com)
+            client: Optional shared HTTP client for the third-party API calls
         """
         self.domain = domain
-        self.apollo_api = ApolloOrganizationAPI(domain)
-        self.coresignal_api = CoreSignalMultiSourceAPI(website=domain)
-        self.llm = ChatOpenAI(model="o3")
+        self.apollo_api = ApolloOrganizationAPI(domain, client=client)
+        self.coresignal_api = CoreSignalMultiSourceAPI(website=domain, client=client)
+        self.llm = get_llm()
         self._company_name = None  # Will be set after fetching data
 
     @property
@@ -66,21 +220,7 @@ class MultiSourceResearcher:
         """
         Load the company research schema from the JSON file
         """
-        schema_path = os.path.join(
-            os.path.dirname(__file__), "../company_research_schema.json"
-        )
-        try:
-            with open(schema_path, "r") as f:
-                schema = json.load(f)
-            return json.dumps(schema, indent=2)
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                f"Company research schema file not found at {schema_path}. Please ensure the schema file exists."
-            )
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(
-                f"Invalid JSON in schema file at {schema_path}: {e}", e.doc, e.pos
-            )
+        return load_company_schema()
 
     async def fetch_apollo_data(self) -> dict:
         """
@@ -90,9 +230,7 @@ class MultiSourceResearcher:
             Tuple of (raw_apollo_data, formatted_apollo_data)
         """
         logger.info("Fetching data from Apollo API...")
-        apollo_data = await asyncio.to_thread(
-            self.apollo_api.organization_enrichment_api
-        )
+        apollo_data = await self.apollo_api.organization_enrichment_api_async()
         return apollo_data
 
     async def fetch_coresignal_data(self) -> dict:
@@ -100,9 +238,7 @@ class MultiSourceResearcher:
         Fetch and format CoreSignel data.
         """
         logger.info("Fetching data from CoreSignel API...")
-        coresignal_data = await asyncio.to_thread(
-            self.coresignal_api.company_multi_source_enrich
-        )
+        coresignal_data = await self.coresignal_api.company_multi_source_enrich_async()
         return coresignal_data
 
     async def fetch_tavily_data(
@@ -123,7 +259,7 @@ class MultiSourceResearcher:
         self,
         apollo_data: dict,
         coresignal_data: dict,
-        customers: List[TavilySearchResult],
+        customers: List[dict],
     ) -> str:
         """
         Generate LLM-powered company report using CoreSignel, Apollo and Tavily data.
@@ -131,107 +267,36 @@ class MultiSourceResearcher:
         Args:
             apollo_data: Formatted Apollo API data
             coresignal_data: Formatted CoreSignel API data
-            customers: List of customer search results
+            customers: Customer search results, already dumped to dicts
 
         Returns:
             Generated markdown report as string
         """
         logger.info("Generating LLM report...")
 
-        news = ""
-        company_updates = coresignal_data.get("company_updates", [])
-        if company_updates:
-            for i, update in enumerate(company_updates[:3], 1):
-                news += f"### News Item {i}\n"
-                news += f"**Date:** {update.get('date', 'No Date')}  \n"
-                # news += "**Source:** LinkedIn Company Updates  \n"
-                news += f"**Summary:** {update.get('description', 'No description available')[:500]}{'...' if len(update.get('description', '')) > 500 else ''}  \n"
-                if update.get("reactions_count"):
-                    news += f"**Engagement:** {update.get('reactions_count')} reactions"
-                if update.get("comments_count"):
-                    news += f", {update.get('comments_count')} comments"
-                news += "\n\n"
-        else:
-            news += "No recent news items found.\n\n"
-
-        # Extract all company updates - description
-        all_company_updates = [
-            update.get("description", "") for update in company_updates
-        ]
-
-        # Extract competitors
-        competitors = coresignal_data.get("competitors", [])
-        # sort competitors by similarity_score
-        competitors.sort(key=lambda x: x.get("similarity_score") or 0, reverse=True)
-        competitors = competitors[:5]
-
-        prompt = f"""
-        You are a research assistant specialized in company analysis. Generate a structured, human-readable markdown report for the company: {self.company_name} using the following data fields and data sources in json format.
-        
-        ## Data fields:
-        Company Overview:
-        - Company Name
-        - Website
-        - Description
-        - Founded Year
-        - Status
-        - Type
-        Industry and Market:
-        - Industry
-        - Keywords
-        Location
-        - HQ and other locations Address, City, State, Country
-        Contact Details -  Emails, Phone no.
-        Leadership & Key Executives:
-        - Name, Title, LinkedIn Profile
-        Employee Insights
-        - Employee Count
-        - Ratings
-        - Employees by Location
-        - Employees by Title
-        - Employee Growth
-        Financials:
-        - Annual Revenue
-        - Recent Financial Performance
-        Funding and Ownership
-        - Funding Rounds
-        - Total Funding
-        - Recent Funding
-        - Private or Public
-        - Investors
-        Competitors:
-        - Name
-        - Revenue and total funding
-        Recent News:
-        - News Title
-        - News Summary
-        - News Date
-        - Source URL
-        Enterprise Customers
-        Online Presence - Website, LinkedIn 
-        - Links
-        - Followers
-        
-        ## Data Sources:
-        Coresignel API: {json.dumps(coresignal_data, indent=2)}
-        Apollo API: {json.dumps(apollo_data, indent=2)}
+        # Top 5 competitors by similarity_score, without sorting the whole list
+        competitors = heapq.nlargest(
+            5,
+            coresignal_data.get("competitors") or [],
+            key=lambda x: x.get("similarity_score") or 0,
+        )
 
-        ## Major/Enterprise Customers (from Tavily)
-        Data: {[c.model_dump() for c in customers]}
-        ---
+        # The API payloads can be large, so trim them to the fields the report
+        # uses and encode them off the event loop
+        coresignal_json, apollo_json = await asyncio.gather(
+            asyncio.to_thread(pretty_json, report_prompt_data(coresignal_data)),
+            asyncio.to_thread(pretty_json, apollo_prompt_data(apollo_data)),
+        )
 
-        Instructions:
-        - Use only the provided data. Do not fabricate or add any information not present above.
-        - For each section, if data is missing or empty, state "No relevant data found."
-        - Remove duplicates and ensure each entry is unique.
-        - Format the report in clear, well-structured markdown with the above sections. Each section should be a separate markdown heading.
-        - **IMPORTANT** Mention sources for each sections. If it is a link create a markdown link. Mark N/A if no source is available.
-        - Do not include any information not present in the provided data.
-        - Extract the source url from the news item/corresponding company update description and add it to the news item.
-        - For Tavily data, create a markdown link for the source url.
-        - **VERY IMPORTANT: Do NOT include any emojis, special characters, or symbols (such as 👀, 🚀, ✅, 📊, etc.) in the report as they can cause PDF generation issues. Use only standard text, numbers, and basic punctuation.**
+        prompt = REPORT_PROMPT_TEMPLATE.render(
+            company_name=self.company_name,
+            coresignal_json=coresignal_json,
+            apollo_json=apollo_json,
+            competitors=competitors,
+            customers=customers,
+        )
 
-        """
+        from langchain_core.messages import SystemMessage
 
         response = await self.llm.ainvoke([SystemMessage(content=prompt)])
         return str(response.content)
@@ -251,20 +316,42 @@ class MultiSourceResearcher:
         tavily_task = self.fetch_tavily_data()
         coresignal_task = self.fetch_coresignal_data()
 
-        # Wait for both data sources
-        (
-            (apollo_data),
-            (customers),
-            coresignal_data,
-        ) = await asyncio.gather(apollo_task, tavily_task, coresignal_task)
+        # Wait for all data sources; one failing API must not abort the others
+        apollo_data, customers, coresignal_data = await asyncio.gather(
+            apollo_task, tavily_task, coresignal_task, return_exceptions=True
+        )
+        if isinstance(apollo_data, Exception):
+            logger.error("Apollo fetch failed: %s", apollo_data)
+            apollo_data = {}
+        if isinstance(customers, Exception):
+            logger.error("Tavily search failed: %s", customers)
+            customers = []
+        if isinstance(coresignal_data, Exception):
+            logger.error("CoreSignal fetch failed: %s", coresignal_data)
+            coresignal_data = {}
+        apollo_data = apollo_data or {}
+        coresignal_data = coresignal_data or {}
 
         # Set company name from API data
         self._set_company_name_from_data(apollo_data, coresignal_data)
 
-        # Generate the LLM report
-        report = await self.generate_llm_company_report(
-            apollo_data, coresignal_data, customers
+        # Dump the search results once for both the prompt and the raw data
+        customers_data = TAVILY_RESULTS_ADAPTER.dump_python(customers or [])
+
+        has_data = bool(
+            apollo_data.get("organization")
+            or coresignal_data.get("company_name")
+            or customers_data
         )
+        if has_data:
+            # Generate the LLM report
+            report = await self.generate_llm_company_report(
+                apollo_data, coresignal_data, customers_data
+            )
+        else:
+            # Nothing for the LLM to summarize, so skip the call entirely
+            logger.warning("No data found for %s, skipping LLM report", self.domain)
+            report = f"# No data found for {self.company_name} ({self.domain})\n"
 
         logger.info("Multi-source research completed successfully")
 
@@ -274,14 +361,16 @@ class MultiSourceResearcher:
             "report": report,
             "raw_data": {
                 "apollo_data": apollo_data,
-                "tavily_customers": [c.model_dump() for c in customers],
+                "tavily_customers": customers_data,
                 "coresignal_data": coresignal_data,
                 # "tavily_news": [n.model_dump() for n in news],
                 # "tavily_competitors": [c.model_dump() for c in competitors],
             },
         }
 
-    def save_report_to_file(self, report: str, results_dir: str | None = None) -> str:
+    async def save_report_to_file(
+        self, report: str, results_dir: str | None = None
+    ) -> str:
         """
         Save the generated report to a markdown file.
 
@@ -298,23 +387,48 @@ class MultiSourceResearcher:
         os.makedirs(results_dir, exist_ok=True)
 
         report_path = os.path.join(
-            results_dir, f"{self.company_name}_multi_source_research_report.md"
+            results_dir,
+            f"{company_slug(self.company_name)}_multi_source_research_report.md",
         )
 
-        with open(report_path, "w") as f:
-            f.write(report)
+        # Write in a worker thread so a large report does not block the loop
+        await asyncio.to_thread(Path(report_path).write_text, report, encoding="utf-8")
 
         logger.info("Report saved to: %s", report_path)
         return report_path
 
 
-# Example usage
+async def enrich_company(company_name: str, domain: str) -> list:
+    """
+    Fetch Apollo and CoreSignal data and the Tavily report for one company
+
+    All three sources are requested concurrently, so the wait is that of the
+    slowest source rather than the sum of all three. Apollo and CoreSignal
+    share one HTTP client; the Tavily report uses its own Tavily client and
+    the OpenAI call that writes it.
+
+    Returns:
+        [apollo_data, coresignal_data, tavily_report]; a source that failed
+        is returned as its exception instead of aborting the others
+    """
+    apollo_api = ApolloOrganizationAPI(domain)
+    coresignal_api = CoreSignalMultiSourceAPI(website=domain)
+    async with create_async_client() as client:
+        return await asyncio.gather(
+            apollo_api.organization_enrichment_api_async(client),
+            coresignal_api.company_multi_source_enrich_async(client),
+            run_company_major_customers_and_news_agent_async(company_name),
+            return_exceptions=True,
+        )
+
+
+# Example usage: python -m researchers.multi_source_researcher
 if __name__ == "__main__":
 
     async def main():
         researcher = MultiSourceResearcher("example.com")
         result = await researcher.research_company()
-        researcher.save_report_to_file(result["report"])
+        await researcher.save_report_to_file(result["report"])
         logger.info("Research completed for %s", result["company_name"])
 
     asyncio.run(main())
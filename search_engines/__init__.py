@@ -0,0 +1 @@
+# Search Engines Package
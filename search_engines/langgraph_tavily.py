@@ -1,14 +1,21 @@
+import logging
 import os
-from typing import List, Optional, TypedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, TypedDict
 
 from dotenv import load_dotenv
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langgraph.graph import END, StateGraph
+from pydantic import BaseModel, Field
+
+from third_party_api.results_dirs import company_slug
+
+if TYPE_CHECKING:
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    from langgraph.graph.state import CompiledStateGraph
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 # Define the state structure
 class ResearchState(TypedDict):
@@ -19,35 +26,60 @@ class ResearchState(TypedDict):
     relevance_reason: Optional[str]
 
 
-# Initialize tools
+class RelevanceCheck(BaseModel):
+    """Structured verdict returned by the relevance check."""
+
+    reason: str = Field(description="Explanation of the verdict")
+    relevant: bool = Field(
+        description="Whether the collected information is about the company"
+    )
+
+
+# LangChain and LangGraph are slow to import, so the tools, model and graph
+# are built on first use rather than when this module is imported
+
+
+@lru_cache(maxsize=1)
+def get_tavily_tool() -> "TavilySearchResults":
+    """Return the shared Tavily search tool"""
+    from langchain_community.tools.tavily_search import TavilySearchResults
+
+    return TavilySearchResults(max_results=5)
 
-tavily_tool = TavilySearchResults(max_results=5)
-llm = ChatOpenAI(model="gpt-4o")
+
+@lru_cache(maxsize=1)
+def get_relevance_llm():
+    """Return the chat model that answers with a validated RelevanceCheck"""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model="gpt-4o").with_structured_output(RelevanceCheck)
 
 
 def search_news(state: ResearchState) -> dict:
     """Search for recent company news"""
     query = f"Recent news about {state['company']} from the last 6 months"
-    results = tavily_tool.invoke(
+    results = get_tavily_tool().invoke(
         {
             "query": query,
             "topic": "news",
             "search_depth": "advanced",
         }
     )
-    print(results)
+    logger.debug("News search results: %s", results)
     return {"news": results}
 
 
 def search_customers(state: ResearchState) -> dict:
     """Search for major company customers"""
     query = f"Major customers of {state['company']}"
-    results = tavily_tool.invoke({"query": query, "search_depth": "advanced"})
+    results = get_tavily_tool().invoke({"query": query, "search_depth": "advanced"})
     return {"customers": results}
 
 
 def check_relevance(state: ResearchState) -> dict:
     """Verify information relevance to the company"""
+    from langchain_core.prompts import ChatPromptTemplate
+
     prompt = ChatPromptTemplate.from_messages(
         [
             (
@@ -62,10 +94,7 @@ def check_relevance(state: ResearchState) -> dict:
                 "Check for:\n"
                 "- Direct mentions of {company}\n"
                 "- Contextual relevance\n"
-                "- Potential confusion with similar names\n\n"
-                "Format response:\n"
-                "REASON: <explanation>\n"
-                "VERDICT: <True/False>",
+                "- Potential confusion with similar names",
             ),
         ]
     )
@@ -91,42 +120,42 @@ def check_relevance(state: ResearchState) -> dict:
         else "No customers found"
     )
 
-    chain = prompt | llm
-    response = chain.invoke(
+    chain = prompt | get_relevance_llm()
+    result = chain.invoke(
         {"company": state["company"], "news": news_str, "customers": customers_str}
     )
 
-    # Parse response
-    reason = str(response.content).split("REASON:")[-1].split("VERDICT:")[0].strip()
-    verdict = "True" in str(response.content).split("VERDICT:")[-1].strip()
+    return {"relevant": result.relevant, "relevance_reason": result.reason}
 
-    return {"relevant": verdict, "relevance_reason": reason}
 
+@lru_cache(maxsize=1)
+def build_research_agent() -> "CompiledStateGraph":
+    """Build and compile the research workflow once per process"""
+    from langgraph.graph import END, START, StateGraph
 
-# Build the workflow
-workflow = StateGraph(ResearchState)
+    workflow = StateGraph(ResearchState)
 
-# Add nodes
-workflow.add_node("search_news", search_news)
-workflow.add_node("search_customers", search_customers)
-workflow.add_node("check_relevance", check_relevance)
+    # Add nodes
+    workflow.add_node("search_news", search_news)
+    workflow.add_node("search_customers", search_customers)
+    workflow.add_node("check_relevance", check_relevance)
 
-# Set entry point
-workflow.set_entry_point("search_news")
+    # The two searches are independent, so fan out to run them in the same step;
+    # check_relevance waits for both before it runs
+    workflow.add_edge(START, "search_news")
+    workflow.add_edge(START, "search_customers")
+    workflow.add_edge(["search_news", "search_customers"], "check_relevance")
+    workflow.add_edge("check_relevance", END)
 
-# Connect nodes
-workflow.add_edge("search_news", "search_customers")
-workflow.add_edge("search_customers", "check_relevance")
-workflow.add_edge("check_relevance", END)
+    # Compile the graph
+    return workflow.compile()
 
-# Compile the graph
-research_agent = workflow.compile()
 
-# Example usage
-if __name__ == "__main__":
-    results = research_agent.invoke(
+def run_research_agent(company: str) -> ResearchState:
+    """Research a company's news and customers and check their relevance"""
+    return build_research_agent().invoke(
         {
-            "company": "getfastr.com",
+            "company": company,
             "news": None,
             "customers": None,
             "relevant": None,
@@ -134,6 +163,14 @@ if __name__ == "__main__":
         }
     )
 
+
+# Example usage: python -m search_engines.langgraph_tavily
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s"
+    )
+    results = run_research_agent("getfastr.com")
+
     # print("\n--- RESEARCH RESULTS ---")
     # print(f"Company: {results['company']}")
     # print(f"Relevance Verified: {results['relevant']}")
@@ -154,8 +191,9 @@ if __name__ == "__main__":
 
     # --- Write structured report to file ---
     os.makedirs("results", exist_ok=True)
-    company_slug = results["company"].replace(".", "_").replace(" ", "_")
-    report_path = f"results/{company_slug}_customers_and_news_report.md"
+    report_path = (
+        f"results/{company_slug(results['company'])}_customers_and_news_report.md"
+    )
     with open(report_path, "w", encoding="utf-8") as f:
         f.write(f"# Company Research Report: {results['company']}\n\n")
         f.write(f"**Relevance Verified:** {results['relevant']}\n\n")
@@ -178,4 +216,4 @@ if __name__ == "__main__":
                     f.write(f"   - Content: {snippet}...\n\n")
         else:
             f.write("No major customers found.\n\n")
-    print(f"\nReport written to {report_path}\n")
+    logger.info("Report written to %s", report_path)
@@ -1,15 +1,30 @@
 import asyncio
+import hashlib
+import html
+import json
+import logging
 import os
+from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from tavily import AsyncTavilyClient
 
+from third_party_api.llm import get_chat_model
+from third_party_api.results_dirs import (
+    REPORT_CACHE_DIR,
+    RESULTS_DIR,
+    company_slug,
+    ensure_dir,
+    read_cached_report,
+    write_cached_report,
+)
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class TavilySearchResult(BaseModel):
     """Schema for Tavily search result items."""
@@ -21,6 +36,10 @@ class TavilySearchResult(BaseModel):
     content: Optional[str] = None
 
 
+# Validates or serializes a whole list of search results in one call
+TAVILY_RESULTS_ADAPTER = TypeAdapter(list[TavilySearchResult])
+
+
 def get_tavily_client():
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
@@ -28,47 +47,47 @@ def get_tavily_client():
     return AsyncTavilyClient(api_key=api_key)
 
 
-async def get_major_customers_async(company_name: str) -> list[TavilySearchResult]:
+async def get_major_customers_async(
+    company_name: str, tavily_client: Optional[AsyncTavilyClient] = None
+) -> list[TavilySearchResult]:
     query = f"Who are the major/enterprise customers of {company_name}?"
-    api_key = os.getenv("TAVILY_API_KEY")
-    tavily_client = AsyncTavilyClient(api_key=api_key)
+    tavily_client = tavily_client or get_tavily_client()
     response = await tavily_client.search(
         query,
         max_results=5,
         search_depth="advanced",
     )
     results = response.get("results", [])
-    print("\n===Major customers (async)===\n")
-    # print(results)
-    return [TavilySearchResult(**r) for r in results if r]
+    logger.debug("Major customers for %s: %d results", company_name, len(results))
+    return TAVILY_RESULTS_ADAPTER.validate_python([r for r in results if r])
 
 
-async def get_recent_news_async(company_name: str) -> list[TavilySearchResult]:
+async def get_recent_news_async(
+    company_name: str, tavily_client: Optional[AsyncTavilyClient] = None
+) -> list[TavilySearchResult]:
     query = f"Recent news about {company_name}"
-    api_key = os.getenv("TAVILY_API_KEY")
-    tavily_client = AsyncTavilyClient(api_key=api_key)
+    tavily_client = tavily_client or get_tavily_client()
     response = await tavily_client.search(
         query, max_results=3, topic="news", days=365, search_depth="advanced"
     )
     results = response.get("results", [])
-    print("\n===Recent news (async)===\n")
-    # print(results)
-    return [TavilySearchResult(**r) for r in results if r]
+    logger.debug("Recent news for %s: %d results", company_name, len(results))
+    return TAVILY_RESULTS_ADAPTER.validate_python([r for r in results if r])
 
 
-async def get_major_competitors_async(company_name: str) -> list[TavilySearchResult]:
+async def get_major_competitors_async(
+    company_name: str, tavily_client: Optional[AsyncTavilyClient] = None
+) -> list[TavilySearchResult]:
     query = f"Who are the major competitors of {company_name}?"
-    api_key = os.getenv("TAVILY_API_KEY")
-    tavily_client = AsyncTavilyClient(api_key=api_key)
+    tavily_client = tavily_client or get_tavily_client()
     response = await tavily_client.search(
         query,
         max_results=5,
         search_depth="advanced",
     )
     results = response.get("results", [])
-    print("\n===Major competitors (async)===\n")
-    # print(results)
-    return [TavilySearchResult(**r) for r in results if r]
+    logger.debug("Major competitors for %s: %d results", company_name, len(results))
+    return TAVILY_RESULTS_ADAPTER.validate_python([r for r in results if r])
 
 
 def format_tavily_results(results: list[TavilySearchResult], section: str) -> str:
@@ -85,30 +104,65 @@ def format_tavily_results(results: list[TavilySearchResult], section: str) -> st
         else:
             lines.append(f"- **{title}**: {summary} [Source]({url})")
     formatted_results = "\n".join(lines)
-    print(f"\n===Formatted {section}===\n")
-    print(formatted_results)
+    logger.debug("Formatted %s:\n%s", section, formatted_results)
     return formatted_results
 
 
-async def run_company_major_customers_and_news_agent_async(company_name: str):
-    model = ChatOpenAI(model="gpt-4o")
+async def gather_company_data_async(
+    company_name: str, tavily_client: AsyncTavilyClient
+) -> tuple[str, str, str]:
+    """
+    Run the news, customer and competitor searches for one company concurrently
 
-    # Gather data
-    recent_news = await get_recent_news_async(company_name)
-    major_customers = await get_major_customers_async(company_name)
-    major_competitors = await get_major_competitors_async(company_name)
-
-    # Format data for prompt
-    formatted_news = format_tavily_results(recent_news, section="news")
-    formatted_customers = format_tavily_results(major_customers, section="customers")
-    formatted_competitors = format_tavily_results(
-        major_competitors, section="competitors"
+    Returns:
+        The formatted (news, customers, competitors) sections for the prompt
+    """
+    recent_news, major_customers, major_competitors = await asyncio.gather(
+        get_recent_news_async(company_name, tavily_client),
+        get_major_customers_async(company_name, tavily_client),
+        get_major_competitors_async(company_name, tavily_client),
+    )
+    return (
+        format_tavily_results(recent_news, section="news"),
+        format_tavily_results(major_customers, section="customers"),
+        format_tavily_results(major_competitors, section="competitors"),
     )
 
-    report = model.invoke(
-        [
-            SystemMessage(
-                content=f"""
+
+def report_cache_path(company_name: str, prompt: str) -> Path:
+    """
+    Path of the cached LLM report for this exact prompt
+
+    The prompt embeds all the search data, so an unchanged prompt means the
+    report can be reused instead of calling the LLM again.
+    """
+    prompt_hash = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+    return REPORT_CACHE_DIR / f"{company_slug(company_name)}_tavily_{prompt_hash}.md"
+
+
+def write_report(company_name: str, report: str) -> Path:
+    """Save a Tavily research report to the results directory"""
+    output_path = (
+        ensure_dir(RESULTS_DIR) / f"{company_slug(company_name)}_tavily_research.md"
+    )
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    logger.info("Report written to %s", output_path)
+    return output_path
+
+
+async def run_company_major_customers_and_news_agent_async(company_name: str) -> str:
+    # LangChain is slow to import, so load it only when a report is generated
+    from langchain_core.messages import SystemMessage
+
+    # Gather data
+    (
+        formatted_news,
+        formatted_customers,
+        formatted_competitors,
+    ) = await gather_company_data_async(company_name, get_tavily_client())
+
+    prompt = f"""
 You are a research assistant specialized in company analysis. 
 Your task is to generate a structured, human-readable markdown report for the company: {company_name}.
 
@@ -152,20 +206,169 @@ The data for these lists is provided below.
 
 Generate the markdown report below:
 """
-            )
+
+    # Reuse the report from an earlier run with identical data. File I/O runs
+    # in a thread so other companies' searches keep making progress.
+    cache_path = report_cache_path(company_name, prompt)
+    report = await asyncio.to_thread(read_cached_report, cache_path)
+    if report is None:
+        model = get_chat_model("gpt-4o")
+        response = await model.ainvoke([SystemMessage(content=prompt)])
+        report = str(response.content)
+        await asyncio.to_thread(write_cached_report, cache_path, report)
+
+    # Save to file
+    await asyncio.to_thread(write_report, company_name, report)
+    return report
+
+
+# Companies per batched LLM call; each report is up to ~2k tokens, so a batch
+# stays well inside gpt-4o's 16k output-token limit
+REPORT_BATCH_SIZE = 5
+
+BATCH_REPORT_INSTRUCTIONS = """
+You are a research assistant specialized in company analysis.
+Your task is to generate a structured, human-readable markdown report for each of
+the companies listed below.
+
+For every company you are provided with three lists:
+- Major or enterprise customers (3-5 items)
+- Recent news headlines or summaries about the company from the last 1 year (0-3 items)
+- Major competitors (3-5 items)
+
+**Only use the information from a company's own lists. Do not fabricate or add any
+information not present in the lists, and never mix data between companies.**
+
+### Instructions
+
+- Only include news, customers, and competitors that are directly relevant to the
+  company. Exclude generic, unrelated, or ambiguous entries.
+- **Important** For each item use bullet points, include a summary, title and a source
+  URL (labelled as 'Source').
+- If any list is empty or contains only irrelevant items, state "No relevant data
+  found" for that section.
+- Remove duplicates and ensure each entry is unique.
+- Format each report in clear, well-structured markdown with the following sections:
+    - # <company name> Research Report
+    - ## Major/Enterprise Customers
+    - ## Recent News
+    - ## Major Competitors
+- For news, include the headline, a brief summary, the published date (if
+  available), and the source URL.
+
+### Output
+
+Return a JSON object of the form {"reports": [{"id": 1, "report": "..."}, ...]}
+with one entry per company, where entry j holds the markdown report for company j.
+"""
+
+
+def parse_batch_reports(content: str) -> dict[int, str]:
+    """
+    Map company ids to reports in a batch reply, skipping malformed entries
+
+    A reply that is not the expected JSON object yields no reports, so every
+    company in the batch is reported as missing rather than the batch failing.
+    """
+    try:
+        entries = json.loads(content)["reports"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        logger.warning("Could not parse batch report reply: %s", e)
+        return {}
+    if not isinstance(entries, list):
+        logger.warning("Batch report reply has no list of reports")
+        return {}
+
+    reports = {}
+    for entry in entries:
+        try:
+            reports[int(entry["id"])] = str(entry["report"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping malformed batch report entry: %s", e)
+    return reports
+
+
+async def write_report_batch_async(
+    companies: list[str], tavily_client: AsyncTavilyClient
+) -> dict[str, Path]:
+    """Research a batch of companies and write their reports from one LLM call"""
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    model = get_chat_model("gpt-4o", json_mode=True)
+
+    company_data = await asyncio.gather(
+        *(gather_company_data_async(name, tavily_client) for name in companies)
+    )
+
+    # Names are escaped so a quote or ">" cannot break out of the attribute
+    blocks = [
+        f"""<company id="{k}" name="{html.escape(name, quote=True)}">
+**Recent news:**
+{news}
+
+**Major customers:**
+{customers}
+
+**Major competitors:**
+{competitors}
+</company>"""
+        for k, (name, (news, customers, competitors)) in enumerate(
+            zip(companies, company_data), start=1
+        )
+    ]
+
+    response = await model.ainvoke(
+        [
+            SystemMessage(content=BATCH_REPORT_INSTRUCTIONS),
+            HumanMessage(content="\n\n".join(blocks)),
         ]
     )
-    # Save to file
-    results_dir = os.path.join(os.path.dirname(__file__), "../results")
-    os.makedirs(results_dir, exist_ok=True)
-    company_slug = company_name.replace(".", "_").replace(" ", "_")
-    output_path = os.path.join(results_dir, f"{company_slug}_tavily_research.md")
-    with open(output_path, "w+") as f:
-        f.write(str(report.content))
-    print(f"\nReport written to {output_path}\n")
+    reports = parse_batch_reports(str(response.content))
+
+    # Map the reports back to their companies by position and write them
+    names, writes = [], []
+    for k, name in enumerate(companies, start=1):
+        if k not in reports:
+            logger.warning("No report returned for %s", name)
+            continue
+        names.append(name)
+        writes.append(asyncio.to_thread(write_report, name, reports[k]))
+    return dict(zip(names, await asyncio.gather(*writes)))
+
+
+async def run_company_batch_async(companies: list[str]) -> dict[str, Path]:
+    """
+    Research several companies and write their reports with batched LLM calls
+
+    The instructions are sent once per call as a shared prefix, followed by a
+    numbered data block per company, so their cost is split across the batch
+    instead of being paid again for every company. Companies are sent at most
+    REPORT_BATCH_SIZE per call so the JSON reply stays within the model's
+    output-token limit; the batches run concurrently.
+
+    Args:
+        companies: Company names to research
+
+    Returns:
+        Dict mapping each company name to the path of its written report
+    """
+    # Search for every company concurrently, sharing one client
+    tavily_client = get_tavily_client()
+    results = await asyncio.gather(
+        *(
+            write_report_batch_async(
+                companies[start : start + REPORT_BATCH_SIZE], tavily_client
+            )
+            for start in range(0, len(companies), REPORT_BATCH_SIZE)
+        )
+    )
+    return {name: path for batch in results for name, path in batch.items()}
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s"
+    )
     asyncio.run(
         run_company_major_customers_and_news_agent_async("getfastr.com (Zmags)")
     )
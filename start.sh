@@ -3,5 +3,8 @@
 # Set default port if not provided
 PORT=${PORT:-8000}
 
+# One uvicorn worker per CPU core unless WEB_CONCURRENCY is set
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-$(nproc)}
+
 # Start the FastAPI application
-exec uvicorn api.company_research_fastapi:app --host 0.0.0.0 --port $PORT 
\ No newline at end of file
+exec uvicorn api.company_research_fastapi:app --host 0.0.0.0 --port $PORT --loop uvloop --http httptools
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+from email_service import pdf_file_attachment  # noqa: E402
+
+
+class PdfFileAttachmentTest(unittest.TestCase):
+    def write_pdf(self, data: bytes) -> str:
+        f = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+        self.addCleanup(os.remove, f.name)
+        with f:
+            f.write(data)
+        return f.name
+
+    def test_attaches_file_contents(self):
+        path = self.write_pdf(b"%PDF-1.7 report")
+
+        attach, file_size = pdf_file_attachment(path, "report.pdf")
+
+        self.assertEqual(file_size, 15)
+        self.assertEqual(attach.get_payload(decode=True), b"%PDF-1.7 report")
+        self.assertEqual(attach.get_filename(), "report.pdf")
+
+    def test_empty_file_is_attached_without_mmap(self):
+        path = self.write_pdf(b"")
+
+        attach, file_size = pdf_file_attachment(path, "report.pdf")
+
+        self.assertEqual(file_size, 0)
+        self.assertEqual(attach.get_payload(decode=True), b"")
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            pdf_file_attachment("/nonexistent/report.pdf", "report.pdf")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,21 @@
-import json
+import logging
 import os
+from pathlib import Path
 
-import requests
+import httpx
+import msgspec
 from dotenv import load_dotenv
 
+from third_party_api.http_client import get_default_client, run_sync
+from third_party_api.results_dirs import API_RESPONSE_DIR, company_slug, ensure_dir
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class ApolloOrganizationAPI:
-    def __init__(self, domain: str):
+    def __init__(self, domain: str, client: httpx.AsyncClient | None = None):
         self.base_url = os.getenv("APOLLO_BASE_URL", "https://api.apollo.io/api/v1")
         api_key = os.getenv("APOLLO_API_KEY")
         if not api_key:
@@ -20,40 +27,67 @@ class ApolloOrganizationAPI:
             "x-api-key": api_key,
         }
         self.domain = domain
+        # Optional shared client so outbound calls reuse pooled connections
+        self.client = client
 
-    def organization_enrichment_api(self):
-        # Check if response file already exists
-        results_dir = os.path.join(
-            os.path.dirname(__file__), "../results/third_party_api_response"
-        )
-        os.makedirs(results_dir, exist_ok=True)
-        company_slug = self.domain.replace(".", "_").replace(" ", "_")
-        file_path = os.path.join(
-            results_dir, f"{company_slug}_apollo_api_response.json"
+    def _cache_file_path(self) -> Path:
+        return (
+            ensure_dir(API_RESPONSE_DIR)
+            / f"{company_slug(self.domain)}_apollo_api_response.json"
         )
 
+    def _load_cached_response(self, file_path: Path):
         # If file exists, load and return the cached response
-        if os.path.exists(file_path):
+        if file_path.exists():
             try:
-                with open(file_path, "r") as f:
-                    result = json.load(f)
-                print(f"\n=== Loaded cached Apollo API response from {file_path} ===\n")
+                with open(file_path, "rb") as f:
+                    result = msgspec.json.decode(f.read())
+                logger.info("Loaded cached Apollo API response from %s", file_path)
                 return result
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error reading cached file {file_path}: {e}")
-                print("Proceeding with fresh API call...")
-
-        url = f"{self.base_url}/organizations/enrich?domain={self.domain}"
-        response = requests.get(url, headers=self.headers)
-        result = response.json()
-
-        print("\n=== Apollo API Result ===\n")
-        # print(json.dumps(result, indent=2))
+            except (msgspec.DecodeError, IOError) as e:
+                logger.warning(
+                    "Error reading cached file %s: %s; proceeding with fresh API call",
+                    file_path,
+                    e,
+                )
+        return None
+
+    def _save_response(self, file_path: Path, result):
         # save the result to a file
+        with open(file_path, "wb") as f:
+            f.write(msgspec.json.format(msgspec.json.encode(result), indent=2))
+        logger.debug("Apollo API response saved to %s", file_path)
 
-        with open(file_path, "w+") as f:
-            json.dump(result, f, indent=2)
+    def organization_enrichment_api(self):
+        """
+        Blocking wrapper around organization_enrichment_api_async for scripts
+        """
+        return run_sync(self.organization_enrichment_api_async)
+
+    async def organization_enrichment_api_async(
+        self, client: httpx.AsyncClient | None = None
+    ):
+        """
+        Fetch Apollo organization data, reusing a cached response when present
+
+        Args:
+            client: Client to send the request with, defaulting to the one
+                given at construction or the event loop's shared client
+        """
+        file_path = self._cache_file_path()
+        result = self._load_cached_response(file_path)
+        if result is not None:
+            return result
+
+        client = client or self.client or get_default_client()
+        response = await client.get(
+            f"{self.base_url}/organizations/enrich",
+            params={"domain": self.domain},
+            headers=self.headers,
+        )
+        result = msgspec.json.decode(response.content)
 
+        self._save_response(file_path, result)
         return result
 
     # def load_company_schema(self):
@@ -119,6 +153,9 @@ class ApolloOrganizationAPI:
 
 # Example usage:
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s"
+    )
     domain = "getfastr.com"
     apollo_api = ApolloOrganizationAPI(domain)
     result = apollo_api.organization_enrichment_api()
@@ -1,17 +1,149 @@
+import asyncio
+import hashlib
+import heapq
 import json
+import logging
 import os
+import re
+from functools import lru_cache
+from pathlib import Path
 from urllib.parse import quote
 
-import requests
+import httpx
+import msgspec
 from dotenv import load_dotenv
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+
+from third_party_api.http_client import get_default_client, run_sync
+from third_party_api.llm import get_chat_model
+from third_party_api.results_dirs import (
+    API_RESPONSE_DIR,
+    REPORT_CACHE_DIR,
+    ensure_dir,
+    read_cached_report,
+    website_slug,
+    write_cached_report,
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "../company_research_schema.json")
+
+# Top-level fields of a CoreSignal response that the LLM report prompt uses;
+# the rest (histories, IDs, raw profiles) only adds prompt tokens
+REPORT_PROMPT_FIELDS = (
+    "company_name",
+    "industry",
+    "type",
+    "status",
+    "description",
+    "hq_location",
+    "hq_full_address",
+    "website",
+    "linkedin_url",
+    "followers_count_linkedin",
+    "employees_count",
+    "size_range",
+    "last_funding_round",
+    "funding_rounds",
+    "last_updated_at",
+)
+# List fields kept in the prompt, cut to their first few items
+REPORT_PROMPT_LIST_LIMITS = {"employees": 10, "company_updates": 5}
+
+# Report-writing rules, the tail of the static report_instructions() prefix
+REPORT_INSTRUCTIONS = """\
+Instructions:
+- Use only the provided data. Do not fabricate or add any information not present in the company data.
+- For each section, if data is missing or empty, state "No relevant data found."
+- Remove duplicates and ensure each entry is unique.
+- Format the report in clear, well-structured markdown with the above sections.
+- Extract the source url from the news item/corresponding company update description and add it to the news item.
+- **VERY IMPORTANT: Do NOT include any emojis, special characters, or symbols (such as 👀, 🚀, ✅, 📊, etc.) in the report as they can cause PDF generation issues. Use only standard text, numbers, and basic punctuation.**
+- For Enterprise Customers section: Carefully analyze the company updates to infer potential customers and clients by looking for:
+  * Direct mentions of company names as clients, customers, or partners
+  * Success stories or case studies mentioning specific organizations
+  * Announcements about new partnerships, collaborations, or deals
+  * Posts celebrating client wins, implementations, or go-lives
+  * Thank you messages or shout-outs to specific companies
+  * Event participation or speaking engagements with other organizations
+  * Product launches or feature announcements mentioning specific users/companies
+- Look for linguistic patterns like: "partnership with [Company]", "client [Company]", "working with [Company]", "proud to announce [Company]", "congratulations to [Company]", "[Company] is now using", "implementation at [Company]"
+- Extract company names from these contexts and list them as potential enterprise customers
+- If no clear customer mentions are found in updates, state "No customer information could be inferred from available company updates"
+"""
+
+# Job titles that identify the company's CEO in the employees list
+CEO_TITLE_RE = re.compile(r"ceo|chief executive officer|founder", re.IGNORECASE)
+# Industry keywords worth listing as a hint at potential competitors
+TECH_KEYWORD_RE = re.compile(r"software|technology|platform|solution", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def load_company_schema() -> str:
+    """
+    Load the company research schema as indented JSON
+
+    The schema file does not change while the process runs, so it is read and
+    re-serialized once and the string is shared by every report prompt.
+    """
+    try:
+        with open(SCHEMA_PATH, "r") as f:
+            schema = json.load(f)
+        return json.dumps(schema, indent=2)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Company research schema file not found at {SCHEMA_PATH}. Please ensure the schema file exists."
+        )
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(
+            f"Invalid JSON in schema file at {SCHEMA_PATH}: {e}", e.doc, e.pos
+        )
+
+
+def format_count(value) -> str:
+    """Format a count with thousands separators, or "Not Found" if it is missing"""
+    return f"{value:,}" if isinstance(value, (int, float)) else "Not Found"
+
+
+def report_prompt_data(api_response: dict) -> dict:
+    """Trim a CoreSignal response to the fields used by the LLM report prompt"""
+    data = {
+        key: api_response[key] for key in REPORT_PROMPT_FIELDS if key in api_response
+    }
+    for key, limit in REPORT_PROMPT_LIST_LIMITS.items():
+        if api_response.get(key):
+            data[key] = api_response[key][:limit]
+    return data
+
+
+@lru_cache(maxsize=1)
+def report_instructions() -> str:
+    """
+    The static part of the LLM report prompt, shared by every company
+
+    It goes first, as the system message, and the company data follows in its
+    own message. Keeping this prefix byte-identical across reports lets
+    OpenAI's automatic prompt caching reuse it instead of billing and
+    processing it in full on every call.
+    """
+    return (
+        "You are a research assistant specialized in company analysis. Generate a "
+        "structured, human-readable markdown report for the company given in the "
+        "next message using the following data fields.\n\n"
+        "## Data fields:\n"
+        f"{load_company_schema()}\n"
+        "Recent news --> Recent news in the company data\n"
+        "Funding --> last_funding_round, funding_rounds\n"
+        "Competitors --> Competitors in the company data\n"
+        "Company Updates for Customer Analysis --> company updates in the company "
+        "data\n\n" + REPORT_INSTRUCTIONS
+    )
+
 
 class CoreSignalMultiSourceAPI:
-    def __init__(self, website: str):
+    def __init__(self, website: str, client: httpx.AsyncClient | None = None):
         self.base_url = os.getenv("CORESIGNAL_BASE_URL", "https://api.coresignal.com")
         api_key = os.getenv("CORESIGNAL_API_KEY")
         if not api_key:
@@ -21,80 +153,81 @@ class CoreSignalMultiSourceAPI:
             "apikey": api_key,
         }
         self.website = website
-        self.website_slug = (
-            self.website.replace("https://", "")
-            .replace("http://", "")
-            .replace("www.", "")
-            .replace(".", "_")
-            .replace("/", "_")
-        )
+        self.website_slug = website_slug(website)
+        # Optional shared client so outbound calls reuse pooled connections
+        self.client = client
 
-    def company_multi_source_enrich(self):
-        """
-        Enrich company data using CoreSignal's multi-source API
-        """
-        # Check if response file already exists
-        results_dir = os.path.join(
-            os.path.dirname(__file__), "../results/third_party_api_response"
-        )
-        file_path = os.path.join(
-            results_dir,
-            f"{self.website_slug}_coresignal_multisource_api_response.json",
+    def _cache_file_path(self) -> Path:
+        return ensure_dir(API_RESPONSE_DIR) / (
+            f"{self.website_slug}_coresignal_multisource_api_response.json"
         )
 
+    def _load_cached_response(self, file_path: Path):
         # If file exists, load and return the cached response
-        if os.path.exists(file_path):
+        if file_path.exists():
             try:
-                with open(file_path, "r") as f:
-                    result = json.load(f)
-                print(
-                    f"\n=== Loaded cached CoreSignal API response from {file_path} ===\n"
-                )
+                with open(file_path, "rb") as f:
+                    result = msgspec.json.decode(f.read())
+                logger.info("Loaded cached CoreSignal API response from %s", file_path)
                 return result
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error reading cached file {file_path}: {e}")
-                print("Proceeding with fresh API call...")
+            except (msgspec.DecodeError, IOError) as e:
+                logger.warning(
+                    "Error reading cached file %s: %s; proceeding with fresh API call",
+                    file_path,
+                    e,
+                )
+        return None
+
+    def _save_response(self, file_path: Path, result):
+        # save to file
+        with open(file_path, "wb") as f:
+            f.write(msgspec.json.format(msgspec.json.encode(result), indent=2))
+        logger.debug("CoreSignal API response saved to %s", file_path)
 
+    def _enrich_url(self) -> str:
         # URL encode the website parameter
         encoded_website = quote(self.website, safe="")
-        url = f"{self.base_url}/cdapi/v2/company_multi_source/enrich?website={encoded_website}"
+        return f"{self.base_url}/cdapi/v2/company_multi_source/enrich?website={encoded_website}"
+
+    def company_multi_source_enrich(self):
+        """
+        Blocking wrapper around company_multi_source_enrich_async for scripts
+        """
+        return run_sync(self.company_multi_source_enrich_async)
+
+    async def company_multi_source_enrich_async(
+        self, client: httpx.AsyncClient | None = None
+    ):
+        """
+        Enrich company data using CoreSignal's multi-source API
+
+        Args:
+            client: Client to send the request with, defaulting to the one
+                given at construction or the event loop's shared client
+        """
+        file_path = self._cache_file_path()
+        result = self._load_cached_response(file_path)
+        if result is not None:
+            return result
 
         try:
-            response = requests.get(url, headers=self.headers)
+            client = client or self.client or get_default_client()
+            response = await client.get(self._enrich_url(), headers=self.headers)
             response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            result = response.json()
-
-            # print(json.dumps(result, indent=2))
-            # save to file
-            os.makedirs(results_dir, exist_ok=True)
-            with open(file_path, "w") as f:
-                json.dump(result, f, indent=2)
-            print(f"\n=== CoreSignal API response saved to {file_path} ===\n")
+            result = msgspec.json.decode(response.content)
+
+            self._save_response(file_path, result)
             return result
 
         except Exception as e:
-            print(f"An error occurred: {e}")
+            logger.error("CoreSignal enrich request failed: %s", e)
             raise
 
     def load_company_schema(self):
         """
         Load the company research schema from the JSON file
         """
-        schema_path = os.path.join(
-            os.path.dirname(__file__), "../company_research_schema.json"
-        )
-        try:
-            with open(schema_path, "r") as f:
-                schema = json.load(f)
-            return json.dumps(schema, indent=2)
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                f"Company research schema file not found at {schema_path}. Please ensure the schema file exists."
-            )
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(
-                f"Invalid JSON in schema file at {schema_path}: {e}", e.doc, e.pos
-            )
+        return load_company_schema()
 
     def generate_markdown_report(self, api_response: dict) -> str:
         """
@@ -102,7 +235,8 @@ class CoreSignalMultiSourceAPI:
         """
         company_name = api_response.get("company_name", "Unknown Company")
 
-        markdown_report = f"""# {company_name} - Company Research Report
+        parts = [
+            f"""# {company_name} - Company Research Report
 
 ## Company Industry Type & Description
 
@@ -121,34 +255,32 @@ class CoreSignalMultiSourceAPI:
 
 ### CEO Profile
 """
+        ]
 
         # Extract CEO information from employees data
         employees = api_response.get("employees", [])
         ceo_found = False
         for employee in employees:
-            job_title = employee.get("job_title", "").lower()
-            if any(
-                title in job_title
-                for title in ["ceo", "chief executive officer", "founder"]
-            ):
-                markdown_report += f"""**Name:** {employee.get("full_name", "Not Found")}  
-**Title:** {employee.get("job_title", "Not Found")}  
+            job_title = employee.get("job_title") or ""
+            if CEO_TITLE_RE.search(job_title):
+                parts.append(f"""**Name:** {employee.get("full_name", "Not Found")}  
+**Title:** {job_title}  
 **LinkedIn:** {employee.get("linkedin_url", "Not Found")}  
 **Start Date:** {employee.get("job_start_date", "Not Found")}  
-"""
+""")
                 ceo_found = True
                 break
 
         if not ceo_found:
-            markdown_report += "CEO information not found.\n"
+            parts.append("CEO information not found.\n")
 
-        markdown_report += f"""
+        parts.append(f"""
 
 ## Website and LinkedIn Page
 
 **Website:** {api_response.get("website", "Not Found")}  
 **LinkedIn Company Page:** {api_response.get("linkedin_url", "Not Found")}  
-**LinkedIn Followers:** {api_response.get("followers_count_linkedin", "Not Found"):,} followers  
+**LinkedIn Followers:** {format_count(api_response.get("followers_count_linkedin"))} followers  
 
 ## Employee Count
 
@@ -156,7 +288,7 @@ class CoreSignalMultiSourceAPI:
 **Size Range:** {api_response.get("size_range", "Not Found")}  
 
 ### Geographic Distribution
-"""
+""")
 
         # Add employee distribution by country
         employee_history = api_response.get("employees_count_history", [])
@@ -164,62 +296,70 @@ class CoreSignalMultiSourceAPI:
             latest_data = employee_history[0]
             employees_by_country = latest_data.get("employees_count_by_country", [])
             for country_data in employees_by_country:
-                markdown_report += f"- **{country_data.get('country', 'Unknown')}:** {country_data.get('employee_count', 0)} employees\n"
+                parts.append(
+                    f"- **{country_data.get('country', 'Unknown')}:** {country_data.get('employee_count', 0)} employees\n"
+                )
         else:
-            markdown_report += "Geographic distribution data not available.\n"
+            parts.append("Geographic distribution data not available.\n")
 
-        markdown_report += """
+        parts.append("""
 
 ## Financing/Funding & Type
 
-"""
+""")
 
         # Look for funding information in the API response
         # CoreSignal API might have funding data in different fields
         funding_info = api_response.get("funding_info", {})
         if funding_info:
-            markdown_report += f"**Total Funding:** {funding_info.get('total_amount', 'Not Found')}  \n"
-            markdown_report += (
+            parts.append(
+                f"**Total Funding:** {funding_info.get('total_amount', 'Not Found')}  \n"
+            )
+            parts.append(
                 f"**Funding Type:** {funding_info.get('type', 'Not Found')}  \n"
             )
-            markdown_report += f"**Number of Rounds:** {funding_info.get('rounds_count', 'Not Found')}  \n"
+            parts.append(
+                f"**Number of Rounds:** {funding_info.get('rounds_count', 'Not Found')}  \n"
+            )
         else:
             # Check for acquisition or investment status
             status_comment = api_response.get("status", {}).get("comment", "")
             if "acquired" in status_comment.lower():
-                markdown_report += "**Status:** Acquired  \n"
+                parts.append("**Status:** Acquired  \n")
             else:
-                markdown_report += (
+                parts.append(
                     "Funding information not available in current data source.\n"
                 )
 
-        markdown_report += """
+        parts.append("""
 
 ## 3 Recent News Items
 
-"""
+""")
 
         # Extract recent company updates as news
         company_updates = api_response.get("company_updates", [])
         if company_updates:
             for i, update in enumerate(company_updates[:3], 1):
-                markdown_report += f"### News Item {i}\n"
-                markdown_report += f"**Date:** {update.get('date', 'No Date')}  \n"
-                markdown_report += "**Source:** LinkedIn Company Updates  \n"
-                markdown_report += f"**Summary:** {update.get('description', 'No description available')[:200]}{'...' if len(update.get('description', '')) > 200 else ''}  \n"
+                parts.append(f"### News Item {i}\n")
+                parts.append(f"**Date:** {update.get('date', 'No Date')}  \n")
+                parts.append("**Source:** LinkedIn Company Updates  \n")
+                parts.append(
+                    f"**Summary:** {update.get('description', 'No description available')[:200]}{'...' if len(update.get('description', '')) > 200 else ''}  \n"
+                )
                 if update.get("reactions_count"):
-                    markdown_report += (
+                    parts.append(
                         f"**Engagement:** {update.get('reactions_count')} reactions"
                     )
                 if update.get("comments_count"):
-                    markdown_report += f", {update.get('comments_count')} comments"
-                markdown_report += "\n\n"
+                    parts.append(f", {update.get('comments_count')} comments")
+                parts.append("\n\n")
         else:
-            markdown_report += "No recent news items found.\n\n"
+            parts.append("No recent news items found.\n\n")
 
-        markdown_report += """## Enterprise Customers
+        parts.append("""## Enterprise Customers
 
-"""
+""")
 
         # Look for customer information
         customers = api_response.get("customers", [])
@@ -228,20 +368,22 @@ class CoreSignalMultiSourceAPI:
         if customers or enterprise_customers:
             all_customers = customers + enterprise_customers
             for customer in all_customers[:5]:  # Show top 5
-                markdown_report += f"- **{customer.get('name', 'Unknown Customer')}**"
+                parts.append(f"- **{customer.get('name', 'Unknown Customer')}**")
                 if customer.get("industry"):
-                    markdown_report += f" - {customer.get('industry')}"
+                    parts.append(f" - {customer.get('industry')}")
                 if customer.get("website"):
-                    markdown_report += f" - {customer.get('website')}"
-                markdown_report += "\n"
+                    parts.append(f" - {customer.get('website')}")
+                parts.append("\n")
         else:
-            markdown_report += "Enterprise customer information not available in current data source.\n"
+            parts.append(
+                "Enterprise customer information not available in current data source.\n"
+            )
 
-        markdown_report += """
+        parts.append("""
 
 ## Competition & Basic Description
 
-"""
+""")
 
         # Look for competitor information
         competitors = api_response.get("competitors", [])
@@ -250,28 +392,25 @@ class CoreSignalMultiSourceAPI:
         if competitors or competition:
             all_competitors = competitors + competition
             for competitor in all_competitors[:5]:  # Show top 5
-                markdown_report += (
-                    f"### {competitor.get('name', 'Unknown Competitor')}\n"
-                )
+                parts.append(f"### {competitor.get('name', 'Unknown Competitor')}\n")
                 if competitor.get("description"):
-                    markdown_report += f"{competitor.get('description')}\n"
+                    parts.append(f"{competitor.get('description')}\n")
                 if competitor.get("website"):
-                    markdown_report += f"**Website:** {competitor.get('website')}  \n"
+                    parts.append(f"**Website:** {competitor.get('website')}  \n")
                 if competitor.get("industry"):
-                    markdown_report += f"**Industry:** {competitor.get('industry')}  \n"
-                markdown_report += "\n"
+                    parts.append(f"**Industry:** {competitor.get('industry')}  \n")
+                parts.append("\n")
         else:
             # Use industry keywords to suggest potential competitors
             keywords = api_response.get("categories_and_keywords", [])
-            markdown_report += "Direct competitor information not available. Based on industry keywords, potential competitors may include companies in:\n"
+            parts.append(
+                "Direct competitor information not available. Based on industry keywords, potential competitors may include companies in:\n"
+            )
             for keyword in keywords[:5]:
-                if any(
-                    term in keyword.lower()
-                    for term in ["software", "technology", "platform", "solution"]
-                ):
-                    markdown_report += f"- {keyword}\n"
+                if TECH_KEYWORD_RE.search(keyword):
+                    parts.append(f"- {keyword}\n")
 
-        markdown_report += f"""
+        parts.append(f"""
 
 ---
 
@@ -280,82 +419,133 @@ class CoreSignalMultiSourceAPI:
 **Report Generated:** {json.dumps({"timestamp": "auto-generated"})}
 
 *This report was generated automatically from available data sources. Some information may be limited based on data availability.*
-"""
+""")
 
-        return markdown_report
+        return "".join(parts)
 
-    def generate_markdown_report_with_llm(self, api_response: dict) -> str:
-        model = ChatOpenAI(model="gpt-4o")
+    def _llm_report_prompt(self, api_response: dict) -> str:
+        """
+        Build the company-specific part of the report prompt
 
+        It is sent after report_instructions(), so every report starts with
+        the same byte-identical prefix.
+        """
         # Extract recent company updates as news
-        news = ""
+        news_parts = []
         company_updates = api_response.get("company_updates", [])
         if company_updates:
             for i, update in enumerate(company_updates[:3], 1):
-                news += f"### News Item {i}\n"
-                news += f"**Date:** {update.get('date', 'No Date')}  \n"
-                # news += "**Source:** LinkedIn Company Updates  \n"
-                news += f"**Summary:** {update.get('description', 'No description available')[:500]}{'...' if len(update.get('description', '')) > 500 else ''}  \n"
+                news_parts.append(f"### News Item {i}\n")
+                news_parts.append(f"**Date:** {update.get('date', 'No Date')}  \n")
+                # news_parts.append("**Source:** LinkedIn Company Updates  \n")
+                news_parts.append(
+                    f"**Summary:** {update.get('description', 'No description available')[:500]}{'...' if len(update.get('description', '')) > 500 else ''}  \n"
+                )
                 if update.get("reactions_count"):
-                    news += f"**Engagement:** {update.get('reactions_count')} reactions"
+                    news_parts.append(
+                        f"**Engagement:** {update.get('reactions_count')} reactions"
+                    )
                 if update.get("comments_count"):
-                    news += f", {update.get('comments_count')} comments"
-                news += "\n\n"
+                    news_parts.append(f", {update.get('comments_count')} comments")
+                news_parts.append("\n\n")
         else:
-            news += "No recent news items found.\n\n"
+            news_parts.append("No recent news items found.\n\n")
+
+        news = "".join(news_parts)
 
-        # Extract all company updates - description
+        # Descriptions of the same updates kept in the JSON below, so the
+        # customer analysis does not bring back the ones trimmed from it
+        update_limit = REPORT_PROMPT_LIST_LIMITS["company_updates"]
         all_company_updates = [
-            update.get("description", "") for update in company_updates
+            update.get("description", "") for update in company_updates[:update_limit]
         ]
 
-        # Extract competitors
-        competitors = api_response.get("competitors", [])
-        # sort competitors by similarity_score
-        competitors.sort(key=lambda x: x.get("similarity_score") or 0, reverse=True)
-        competitors = competitors[:5]
-
-        prompt = f"""
-        You are a research assistant specialized in company analysis. Generate a structured, human-readable markdown report for the company: {
-            self.website
-        } using the following data fields.
-        
-        ## Data fields:
-        {self.load_company_schema()}
-        Recent news --> {news}
-        Funding --> last_funding_round, funding_rounds
-        Competitors --> {competitors}
-        Company Updates for Customer Analysis --> {all_company_updates}
-        
-        Coresignal data:
-        {json.dumps(api_response, indent=2)}
-
-        Instructions:
-        - Use only the provided data. Do not fabricate or add any information not present above.
-        - For each section, if data is missing or empty, state "No relevant data found."
-        - Remove duplicates and ensure each entry is unique.
-        - Format the report in clear, well-structured markdown with the above sections.
-        - Extract the source url from the news item/corresponding company update description and add it to the news item.
-        - **VERY IMPORTANT: Do NOT include any emojis, special characters, or symbols (such as 👀, 🚀, ✅, 📊, etc.) in the report as they can cause PDF generation issues. Use only standard text, numbers, and basic punctuation.**
-        - For Enterprise Customers section: Carefully analyze the company updates to infer potential customers and clients by looking for:
-          * Direct mentions of company names as clients, customers, or partners
-          * Success stories or case studies mentioning specific organizations
-          * Announcements about new partnerships, collaborations, or deals
-          * Posts celebrating client wins, implementations, or go-lives
-          * Thank you messages or shout-outs to specific companies
-          * Event participation or speaking engagements with other organizations
-          * Product launches or feature announcements mentioning specific users/companies
-        - Look for linguistic patterns like: "partnership with [Company]", "client [Company]", "working with [Company]", "proud to announce [Company]", "congratulations to [Company]", "[Company] is now using", "implementation at [Company]"
-        - Extract company names from these contexts and list them as potential enterprise customers
-        - If no clear customer mentions are found in updates, state "No customer information could be inferred from available company updates"
+        # Extract the five closest competitors by similarity_score
+        competitors = heapq.nlargest(
+            5,
+            api_response.get("competitors") or [],
+            key=lambda x: x.get("similarity_score") or 0,
+        )
+
+        # Serialize only the fields the report needs, once, with msgspec.
+        # Competitors are already listed above, so they are not repeated.
+        api_json = msgspec.json.format(
+            msgspec.json.encode(report_prompt_data(api_response)), indent=2
+        ).decode("utf-8")
+
+        return f"""Company: {self.website}
+
+Recent news --> {news}
+Competitors --> {competitors}
+Company Updates for Customer Analysis --> {all_company_updates}
+
+Coresignal data:
+{api_json}
+"""
+
+    def _report_cache_path(self, prompt: str) -> Path:
+        """
+        Path of the cached LLM report for this exact prompt
+
+        The prompt embeds the whole API response, so an unchanged prompt means
+        the report can be reused instead of calling the LLM again.
         """
+        full_prompt = report_instructions() + prompt
+        prompt_hash = hashlib.blake2b(
+            full_prompt.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return REPORT_CACHE_DIR / f"{self.website_slug}_coresignal_{prompt_hash}.md"
+
+    def generate_markdown_report_with_llm(self, api_response: dict) -> str:
+        prompt = self._llm_report_prompt(api_response)
+        cache_path = self._report_cache_path(prompt)
+        report = read_cached_report(cache_path)
+        if report is not None:
+            return report
+
+        # LangChain is slow to import, so load it only when a report is generated
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        model = get_chat_model("gpt-4o")
+        response = model.invoke(
+            [
+                SystemMessage(content=report_instructions()),
+                HumanMessage(content=prompt),
+            ]
+        )
+        report = str(response.content)
+
+        write_cached_report(cache_path, report)
+        return report
+
+    async def generate_markdown_report_with_llm_async(self, api_response: dict) -> str:
+        """Generate the LLM markdown report without blocking the event loop"""
+        prompt = self._llm_report_prompt(api_response)
+        cache_path = self._report_cache_path(prompt)
+        report = await asyncio.to_thread(read_cached_report, cache_path)
+        if report is not None:
+            return report
+
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        model = get_chat_model("gpt-4o")
+        response = await model.ainvoke(
+            [
+                SystemMessage(content=report_instructions()),
+                HumanMessage(content=prompt),
+            ]
+        )
+        report = str(response.content)
 
-        response = model.invoke([SystemMessage(content=prompt)])
-        return str(response.content)
+        await asyncio.to_thread(write_cached_report, cache_path, report)
+        return report
 
 
 # Example usage:
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s"
+    )
     website = "https://www.jrni.com"
     coresignal_api = CoreSignalMultiSourceAPI(website)
 
@@ -0,0 +1,48 @@
+import asyncio
+import weakref
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Default clients by event loop, for API objects created without a shared client
+_default_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client for outbound third-party API calls"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0,
+    )
+
+
+def get_default_client() -> httpx.AsyncClient:
+    """
+    Return the running event loop's default client, creating it on first use
+
+    The API server passes its own client to every API object; scripts and
+    other callers that do not still share one connection pool per loop
+    instead of opening a new client for every request.
+    """
+    loop = asyncio.get_running_loop()
+    client = _default_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _default_clients[loop] = create_async_client()
+    return client
+
+
+def run_sync(fetch: Callable[[httpx.AsyncClient], Awaitable[T]]) -> T:
+    """
+    Run an async API call to completion from synchronous code
+
+    The call gets its own client, which is closed before the loop exits.
+    """
+
+    async def main() -> T:
+        async with create_async_client() as client:
+            return await fetch(client)
+
+    return asyncio.run(main())
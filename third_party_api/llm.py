@@ -0,0 +1,27 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+@lru_cache(maxsize=4)
+def get_chat_model(name: str = "gpt-4o", json_mode: bool = False) -> "ChatOpenAI":
+    """
+    Return the process-wide chat model for the given settings
+
+    Reusing the client skips its configuration validation and keeps its
+    HTTP connections to the OpenAI API open between reports. LangChain is
+    imported here because its import tree is slow to load.
+
+    Args:
+        name: OpenAI model name
+        json_mode: Constrain replies to a single JSON object
+    """
+    from langchain_openai import ChatOpenAI
+
+    if json_mode:
+        return ChatOpenAI(
+            model=name, model_kwargs={"response_format": {"type": "json_object"}}
+        )
+    return ChatOpenAI(model=name)
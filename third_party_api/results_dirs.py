@@ -0,0 +1,68 @@
+import logging
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "results"
+# Cached raw responses from the Apollo and CoreSignal APIs
+API_RESPONSE_DIR = RESULTS_DIR / "third_party_api_response"
+# Cached LLM reports, keyed by a hash of their prompt
+REPORT_CACHE_DIR = RESULTS_DIR / "report_cache"
+
+# Maps characters that are unsafe or awkward in file names to "_" in one pass
+_SLUG_TABLE = str.maketrans({c: "_" for c in ' ./\\:*?"<>|'})
+# Scheme and "www." prefix dropped from a website before it is slugified
+_URL_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?")
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path: Path) -> Path:
+    """
+    Create a results directory on first use and return it
+
+    Memoized so per-request cache lookups and writes don't repeat the
+    makedirs stat calls once the directory exists.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def company_slug(name: str) -> str:
+    """Turn a company name or domain into a safe results file name prefix"""
+    return name.translate(_SLUG_TABLE)
+
+
+def website_slug(website: str) -> str:
+    """Like company_slug, but without the website's scheme and "www." prefix"""
+    return company_slug(_URL_PREFIX_RE.sub("", website))
+
+
+def read_cached_report(cache_path: Path) -> Optional[str]:
+    """Return a cached LLM report, or None if there is none for this prompt"""
+    try:
+        report = cache_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    logger.info("Loaded cached report from %s", cache_path)
+    return report
+
+
+def write_cached_report(cache_path: Path, report: str):
+    """
+    Save an LLM report to the cache atomically
+
+    The report is written to a temporary file next to its final path and then
+    renamed into place, so a crash mid-write never leaves a truncated report
+    to be served for every later run of the same prompt.
+    """
+    ensure_dir(cache_path.parent)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=cache_path.parent, suffix=".tmp", delete=False
+    ) as f:
+        f.write(report)
+    os.replace(f.name, cache_path)